@@ -1,3 +1,12 @@
-from .app import App
+from typing import Any
 
 __all__ = ["App"]
+
+
+def __getattr__(name: str) -> Any:
+    # App pulls in prompt_toolkit; load it only when the REPL is started, not
+    # for every import of the package (scripts, import worker processes).
+    if name == "App":
+        from .app import App
+        return App
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
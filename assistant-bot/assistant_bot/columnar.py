@@ -0,0 +1,408 @@
+import sys
+import itertools
+from array import array
+from collections.abc import MutableMapping
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple, Any
+from weakref import WeakValueDictionary
+
+from assistant_bot.models import AddressBook, Record, birthday_window
+from assistant_bot.utils import stats
+from assistant_bot.utils.validators import format_birthday, format_phone, pack_phone
+
+__all__ = ["ColumnStore", "ColumnarAddressBook"]
+
+# Compact the phone/email pools once dead entries outnumber live ones.
+_COMPACT_MIN_GARBAGE = 4096
+
+
+class ColumnStore(MutableMapping):
+    """
+    Column-oriented storage of contact records.
+
+    Each contact is a row across parallel arrays:
+    - phones: packed integers (+380501234567 -> 380501234567) in one shared pool,
+      addressed by per-row start/count arrays; a parallel array maps each
+      pool slot back to its row
+    - email: UTF-8 bytes in one shared buffer, addressed by start/length arrays
+    - birthday: proleptic Gregorian ordinal, 0 when unset
+    - notes/tags: tuples (tags are interned, empty rows share the empty tuple)
+
+    Records are materialized on access and kept only while referenced
+    elsewhere, so lookups of a contact in use return the same object. They
+    are attached to the owning ColumnarAddressBook, whose mutation hook
+    writes them back, so a materialized record behaves like a stored one.
+    """
+
+    def __init__(self, owner: Optional[AddressBook] = None) -> None:
+        self.owner = owner
+        self._reset()
+
+    def _reset(self) -> None:
+        self._rows: Dict[str, int] = {}
+        self._names: List[Optional[str]] = []
+        self._phone_pool = array('Q')
+        self._phone_rows = array('I')
+        self._phone_start = array('Q')
+        self._phone_count = array('H')
+        self._email_pool = bytearray()
+        self._email_start = array('Q')
+        self._email_len = array('L')
+        self._birthdays = array('l')
+        self._notes: List[Tuple[str, ...]] = []
+        self._tags: List[Tuple[str, ...]] = []
+        self._free: List[int] = []
+        self._phone_garbage = 0
+        self._email_garbage = 0
+        # Materialized records still in use (weakly held).
+        self._live: 'WeakValueDictionary[str, Record]' = WeakValueDictionary()
+
+    # --- Mapping Protocol ---
+
+    def __getitem__(self, name: str) -> Record:
+        record = self._live.get(name)
+        if record is None:
+            record = self._live[name] = self._materialize(self._rows[name])
+        return record
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        row = self._rows.get(name)
+        if row is None:
+            row = self._allocate(name)
+        self.write(row, record)
+        self._live[name] = record
+
+    def __delitem__(self, name: str) -> None:
+        row = self._rows.pop(name)
+        self._release(row)
+        self._live.pop(name, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._rows
+
+    def clear(self) -> None:
+        self._reset()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The owner re-attaches itself on unpickling.
+        state = self.__dict__.copy()
+        state['owner'] = None
+        del state['_live']
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._live = WeakValueDictionary()
+        # Older pickles have no slot -> row column.
+        if '_phone_rows' not in state:
+            self._phone_rows = array('I', bytes(len(self._phone_pool) * array('I').itemsize))
+            for row in self._rows.values():
+                start, count = self._phone_start[row], self._phone_count[row]
+                self._phone_rows[start:start + count] = array('I', [row]) * count
+
+    # --- Column Access (no materialization) ---
+
+    def iter_rows(self) -> Iterator[Tuple[str, List[str], Optional[str], Optional[str], List[str], List[str]]]:
+        """Yields (name, phones, email, birthday, notes, tags) straight from the columns."""
+        for name, row in self._rows.items():
+            ordinal = self._birthdays[row]
+            yield (
+                name,
+                self._phones_of(row),
+                self._email_of(row),
+                format_birthday(date.fromordinal(ordinal)) if ordinal else None,
+                list(self._notes[row]),
+                list(self._tags[row])
+            )
+
+    # --- Column Scans (queries without per-contact indexes) ---
+
+    def owner_of_phone(self, number: int) -> Optional[str]:
+        """Returns the contact holding 'number' (the first one in the pool), or None."""
+        for slot in _matching_items(self._phone_pool, number):
+            row = self._phone_rows[slot]
+            start = self._phone_start[row]
+            if self._names[row] is not None and start <= slot < start + self._phone_count[row]:
+                return self._names[row]
+        return None
+
+    def owner_of_email(self, email: str) -> Optional[str]:
+        """Returns the contact holding 'email' (the first one in the pool), or None."""
+        key = email.encode('utf-8')
+        pos = self._email_pool.find(key)
+        while pos != -1:
+            for row in _matching_items(self._email_start, pos):
+                if self._email_len[row] == len(key) and self._names[row] is not None:
+                    return self._names[row]
+            pos = self._email_pool.find(key, pos + 1)
+        return None
+
+    def names_with_tag(self, tag: str) -> List[str]:
+        tags = self._tags
+        return [name for name, row in self._rows.items() if tag in tags[row]]
+
+    def tags_by_name(self) -> Dict[str, Sequence[str]]:
+        tags = self._tags
+        return {name: tags[row] for name, row in self._rows.items() if tags[row]}
+
+    def unique_tags(self) -> Set[str]:
+        return set(itertools.chain.from_iterable(self._tags))
+
+    def birthdays_in(self, window: Dict[Tuple[int, int], int]) -> List[Tuple[int, str]]:
+        """
+        Returns (days_until, name) for birthdays whose (month, day) is in
+        'window' (mapped to days_until), ordered by days_until.
+        """
+        ordinals = self._birthdays
+        born = set(ordinals)
+        born.discard(0)
+        if not born or not window:
+            return []
+
+        # Every ordinal in the stored years that falls on a window day
+        wanted: Dict[int, int] = {}
+        for year in range(date.fromordinal(min(born)).year, date.fromordinal(max(born)).year + 1):
+            for (month, day), offset in window.items():
+                try:
+                    wanted[date(year, month, day).toordinal()] = offset
+                except ValueError:  # 29-Feb in a common year
+                    pass
+
+        matches = [
+            (wanted[ordinal], name)
+            for name, ordinal in zip(self._rows, map(ordinals.__getitem__, self._rows.values()))
+            if ordinal in wanted
+        ]
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    def write_back(self, record: Record) -> None:
+        """Re-encodes a materialized record if its contact is still stored."""
+        row = self._rows.get(record.name.value)
+        if row is not None:
+            self.write(row, record)
+
+    def birthday_value(self, name: str) -> Optional[str]:
+        ordinal = self._birthdays[self._rows[name]]
+        return format_birthday(date.fromordinal(ordinal)) if ordinal else None
+
+    # --- Row Encoding ---
+
+    def write(self, row: int, record: Record) -> None:
+        """Encodes a record into an existing row."""
+        phones = [p.number for p in record.phones]
+        start, count = self._phone_start[row], self._phone_count[row]
+        if len(phones) <= count:
+            self._phone_pool[start:start + len(phones)] = array('Q', phones)
+            self._phone_garbage += count - len(phones)
+        else:
+            self._phone_garbage += count
+            self._phone_start[row] = len(self._phone_pool)
+            self._phone_pool.extend(phones)
+            self._phone_rows.extend(array('I', [row]) * len(phones))
+        self._phone_count[row] = len(phones)
+
+        email = record.email.value.encode('utf-8') if record.email else b''
+        start, length = self._email_start[row], self._email_len[row]
+        if len(email) <= length:
+            self._email_pool[start:start + len(email)] = email
+            self._email_garbage += length - len(email)
+        else:
+            self._email_garbage += length
+            self._email_start[row] = len(self._email_pool)
+            self._email_pool.extend(email)
+        self._email_len[row] = len(email)
+
+        self._birthdays[row] = record.birthday.date_obj.toordinal() if record.birthday else 0
+        self._notes[row] = tuple(record.notes)
+        self._tags[row] = tuple(sys.intern(t) for t in record.tags)
+
+        self._maybe_compact()
+
+    def _materialize(self, row: int) -> Record:
+        ordinal = self._birthdays[row]
+        record = Record.from_trusted(
+            self._names[row],
+            phones=self._numbers_of(row),
+            email=self._email_of(row),
+            birthday=date.fromordinal(ordinal) if ordinal else None,
+            notes=self._notes[row],
+            tags=self._tags[row]
+        )
+        if self.owner is not None:
+            self.owner._attach(record)
+        return record
+
+    def _numbers_of(self, row: int) -> array:
+        start = self._phone_start[row]
+        return self._phone_pool[start:start + self._phone_count[row]]
+
+    def _phones_of(self, row: int) -> List[str]:
+        return [format_phone(p) for p in self._numbers_of(row)]
+
+    def _email_of(self, row: int) -> Optional[str]:
+        length = self._email_len[row]
+        if not length:
+            return None
+        start = self._email_start[row]
+        return self._email_pool[start:start + length].decode('utf-8')
+
+    # --- Row Allocation ---
+
+    def _allocate(self, name: str) -> int:
+        if self._free:
+            row = self._free.pop()
+            self._names[row] = name
+        else:
+            row = len(self._names)
+            self._names.append(name)
+            self._phone_start.append(len(self._phone_pool))
+            self._phone_count.append(0)
+            self._email_start.append(len(self._email_pool))
+            self._email_len.append(0)
+            self._birthdays.append(0)
+            self._notes.append(())
+            self._tags.append(())
+        self._rows[name] = row
+        return row
+
+    def _release(self, row: int) -> None:
+        self._phone_garbage += self._phone_count[row]
+        self._email_garbage += self._email_len[row]
+        self._names[row] = None
+        self._phone_count[row] = 0
+        self._email_len[row] = 0
+        self._birthdays[row] = 0
+        self._notes[row] = ()
+        self._tags[row] = ()
+        self._free.append(row)
+
+    def _maybe_compact(self) -> None:
+        """Rewrites the phone/email pools without dead entries once they dominate."""
+        if self._phone_garbage > max(_COMPACT_MIN_GARBAGE, len(self._phone_pool) // 2):
+            pool = array('Q')
+            rows = array('I')
+            for row in self._rows.values():
+                start, count = self._phone_start[row], self._phone_count[row]
+                self._phone_start[row] = len(pool)
+                pool.extend(self._phone_pool[start:start + count])
+                rows.extend(array('I', [row]) * count)
+            self._phone_pool = pool
+            self._phone_rows = rows
+            self._phone_garbage = 0
+
+        if self._email_garbage > max(_COMPACT_MIN_GARBAGE, len(self._email_pool) // 2):
+            pool = bytearray()
+            for row in self._rows.values():
+                start = self._email_start[row]
+                self._email_start[row] = len(pool)
+                pool.extend(self._email_pool[start:start + self._email_len[row]])
+            self._email_pool = pool
+            self._email_garbage = 0
+
+
+def _matching_items(items: array, value: int) -> Iterator[int]:
+    """Yields the indexes of 'value' in an integer array (scanned in place, without a copy)."""
+    start = 0
+    while True:
+        try:
+            start = items.index(value, start)
+        except ValueError:
+            return
+        yield start
+        start += 1
+
+
+class ColumnarAddressBook(AddressBook):
+    """
+    AddressBook backed by a ColumnStore instead of a dict of Record objects.
+    find, add_record, delete and all queries behave as in AddressBook;
+    find materializes a Record (or returns the one still in use) whose
+    mutators write back.
+    Phone, email, tag and birthday queries scan the columns instead of
+    keeping AddressBook's per-contact indexes, which would hold a second
+    copy of that data (the full-text SearchIndex is kept).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__()
+        self.data = ColumnStore(self)
+        self._search.reset(self.data)
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        store = state.get("data") or ColumnStore()
+        store.owner = self
+        super().__setstate__({"data": store})
+
+    def iter_rows(self) -> Iterator[Tuple[str, List[str], Optional[str], Optional[str], List[str], List[str]]]:
+        stats.count('scan.iter_rows')
+        return self.data.iter_rows()
+
+    def _birthday_value(self, name: str) -> str:
+        return self.data.birthday_value(name)
+
+    def _attach_all(self) -> None:
+        # Records are attached as they are materialized.
+        pass
+
+    def _detach_all(self) -> None:
+        # Materialized records are not tracked; write-back ignores unknown names.
+        pass
+
+    def _record_mutated(self, record: Record) -> None:
+        self.data.write_back(record)
+        super()._record_mutated(record)
+
+    # --- Queries (column scans) ---
+
+    def _scan_birthdays(self, today: date, days: int) -> Iterator[Tuple[int, str]]:
+        stats.count('scan.birthday')
+        window: Dict[Tuple[int, int], int] = {}
+        for key, offset in birthday_window(today, days):
+            window.setdefault(key, offset)
+        return iter(self.data.birthdays_in(window))
+
+    def find_by_tag(self, tag: str) -> List[str]:
+        stats.count('scan.tag')
+        return self.data.names_with_tag(Record._normalize_tag(tag))
+
+    def get_all_tags(self) -> Dict[str, Sequence[str]]:
+        stats.count('scan.tag')
+        return self.data.tags_by_name()
+
+    def get_unique_tags(self) -> Set[str]:
+        return self.data.unique_tags()
+
+    def find_phone_global(self, phone: str) -> Optional[str]:
+        stats.count('scan.phone')
+        number = pack_phone(phone)
+        return self.data.owner_of_phone(number) if number is not None else None
+
+    def find_email_global(self, email: str) -> Optional[str]:
+        stats.count('scan.email')
+        return self.data.owner_of_email(email)
+
+    # --- Index Maintenance (nothing to maintain) ---
+
+    def _ensure_indexes(self) -> None:
+        self._indexed = True
+
+    def _link(self, record: Record) -> None:
+        record._book = self
+
+    def _unlink(self, record: Record) -> None:
+        record._book = None
+
+    def _skip_index(self, value: Any, name: str) -> None:
+        """Record mutators report index changes here; the columns are already current."""
+
+    _index_phone = _unindex_phone = _index_email = _unindex_email = _skip_index
+    _index_tag = _unindex_tag = _index_birthday = _unindex_birthday = _skip_index
@@ -1,22 +1,20 @@
+import re
 import shlex
 import random
+import time
+import itertools
 from functools import wraps
-from typing import Callable, List, Dict, Optional, Tuple, Any
+from typing import Callable, List, Dict, Optional, Tuple, Any, Iterable, Sequence
 
-from rich.table import Table
-from rich.panel import Panel
-from rich import box
-from rich.align import Align
-
-from assistant_bot.config import DEFAULT_BIRTHDAY_LOOKAHEAD_DAYS
+from assistant_bot.config import DEFAULT_BIRTHDAY_LOOKAHEAD_DAYS, SEARCH_RANK_RESULTS, PAGE_SIZE, OUTPUT_FORMAT
 from assistant_bot.models import AddressBook, Record
 from assistant_bot.utils.console import (
     console, print_error, print_success, print_info, 
-    print_warning, print_duplicate_error
+    print_warning, print_duplicate_error, write_rows, errors_printed, last_error, PLAIN_FORMATS
 )
 from assistant_bot.utils.validators import validate_phone, validate_email, normalize_phone
-from assistant_bot import import_export
 from assistant_bot import storage
+from assistant_bot.utils import stats
 from assistant_bot.utils.ux_messages import (
     UNKNOWN_COMMAND_MESSAGES, MISSING_ARGS_MESSAGES,
     CONTACT_ADDED_MESSAGES, CONTACT_UPDATED_MESSAGES, PHONE_ADDED_MESSAGES,
@@ -29,9 +27,29 @@ from assistant_bot.utils.ux_messages import (
     INVALID_BIRTHDAY_MESSAGES, INVALID_INDEX_MESSAGES
 )
 
+# rich.table/panel/align and import_export are imported by the handlers that
+# use them, so they are not loaded before the first prompt.
+
 # Registry for commands.
 COMMAND_REGISTRY: Dict[str, Tuple[Callable[..., Any], str]] = {}
 
+# Listing output: (format, page, limit); limit None means every row
+View = Tuple[str, int, Optional[int]]
+# Table column: (title, field name, style)
+Column = Tuple[str, str, str]
+# Separator for list values in table cells (default ", ")
+_CELL_SEPARATORS = {"notes": "\n"}
+# Batch line that failed: (line number, command line, error message)
+BatchFailure = Tuple[int, str, str]
+# Tokens of a line without quotes or escapes (shlex's whitespace set)
+_PLAIN_TOKEN_RE = re.compile(r"[^ \t\r\n]+")
+# Shell words made of plain characters and closed quotes, whitespace, or any
+# other character (an escape or unclosed quote: the line goes to shlex)
+_QUOTED_TOKEN_RE = re.compile(r"""((?:[^ \t\r\n"'\\]|"[^"\\]*"|'[^']*')+)|[ \t\r\n]+|(.)""")
+_QUOTES_RE = re.compile(r""""([^"]*)"|'([^']*)'""")
+# False while run_batch runs: stdin holds the script, so commands must not prompt
+_interactive = True
+
 
 def command(name: str, help_text: str = "") -> Callable:
     """Decorator to register a bot command."""
@@ -49,7 +67,11 @@ def command(name: str, help_text: str = "") -> Callable:
 @command("help", "Show available commands")
 def handle_help(book: AddressBook, args: List[str]) -> None:
     """Displays commands grouped by category."""
-    
+    from rich import box
+    from rich.align import Align
+    from rich.panel import Panel
+    from rich.table import Table
+
     categories = {
         "📇 Contact Management": [
             "add", "all", "change", "add_phone", "phone", "delete", 
@@ -63,7 +85,7 @@ def handle_help(book: AddressBook, args: List[str]) -> None:
             "add_tag", "remove_tag", "list_tags", "filter_by_tag"
         ],
         "💾 System & Data": [
-            "import", "export", "delete_all", "help", "exit", "close"
+            "import", "export", "delete_all", "stats", "help", "exit", "close"
         ]
     }
 
@@ -167,8 +189,8 @@ def handle_add(book: AddressBook, args: List[str]) -> None:
         else:
             print_info(f"Contact '{name}' already up to date.")
             
-        # Strict Sync Trigger
-        storage.save_all(book)
+        # Journal Sync Trigger
+        storage.save_changes(book)
 
     except ValueError as e:
         print_error(str(e))
@@ -196,7 +218,7 @@ def handle_change(book: AddressBook, args: List[str]) -> None:
     try:
         record.edit_phone(old_phone, new_phone)
         print_success(random.choice(PHONE_UPDATED_MESSAGES).format(name=name))
-        storage.save_all(book) 
+        storage.save_changes(book) 
     except ValueError as e:
         print_error(str(e))
 
@@ -224,7 +246,7 @@ def handle_add_phone(book: AddressBook, args: List[str]) -> None:
             try:
                 record.add_phone(phone)
                 print_success(random.choice(PHONE_ADDED_MESSAGES).format(name=name))
-                storage.save_all(book)
+                storage.save_changes(book)
             except ValueError:
                 print_error(random.choice(INVALID_PHONE_MESSAGES).format(phone=phone))
                 return
@@ -243,41 +265,28 @@ def handle_delete(book: AddressBook, args: List[str]) -> None:
     name = args[0]
     if book.delete(name):
         print_success(random.choice(CONTACT_DELETED_MESSAGES).format(name=name))
-        storage.save_all(book)
+        storage.save_changes(book)
     else:
         print_error(random.choice(CONTACT_NOT_FOUND_MESSAGES).format(name=name))
 
 
-@command("search", "Search contacts: search <query>")
+@command("search", "Search contacts: search <query> [--page N] [--limit N] [--format F]")
 def handle_search(book: AddressBook, args: List[str]) -> None:
+    view = _pop_view(args)
+    if view is None:
+        return
     if not args:
         print_error(random.choice(MISSING_ARGS_MESSAGES).format(syntax="search <query>"))
         return
     
     query = args[0].lower()
-    results = {}
-    
-    for name, record in book.data.items():
-        # Check name
-        if query in name.lower():
-            results[name] = record
-            continue
-        
-        # Check phones
-        for phone in record.phones:
-            if query in phone.value:
-                results[name] = record
-                break
-        
-        # Check email
-        if record.email and query in record.email.value.lower():
-            results[name] = record
+    names = book.search(query, ranked=SEARCH_RANK_RESULTS)
     
-    if not results:
+    if not names and view[0] == "rich":
         print_info(f"No contacts found matching '{query}'")
         return
         
-    _print_contacts_table(results)
+    _print_contacts_table(book, names, len(names), view)
 
 
 @command("phone", "Show phones: phone <name>")
@@ -316,7 +325,7 @@ def handle_add_email(book: AddressBook, args: List[str]) -> None:
     try:
         record.add_email(email)
         print_success(random.choice(EMAIL_UPDATED_MESSAGES).format(name=name))
-        storage.save_all(book)
+        storage.save_changes(book)
     except ValueError:
         print_error(random.choice(INVALID_EMAIL_MESSAGES).format(email=email))
 
@@ -336,67 +345,189 @@ def handle_add_birthday(book: AddressBook, args: List[str]) -> None:
     try:
         record.add_birthday(bday)
         print_success(random.choice(BIRTHDAY_UPDATED_MESSAGES).format(name=name))
-        storage.save_all(book)
+        storage.save_changes(book)
     except ValueError:
         print_error(random.choice(INVALID_BIRTHDAY_MESSAGES))
 
 
-@command("all", "Show all contact info")
+@command("all", "Show all contact info: all [--page N] [--limit N] [--format F]")
 def handle_all(book: AddressBook, args: List[str]) -> None:
-    if not book.data:
+    view = _pop_view(args)
+    if view is None:
+        return
+    if not book.data and view[0] == "rich":
         print_info("No contacts found.")
         return
 
-    table = Table(title="All Contacts Details")
-    table.add_column("Full Name", style="cyan")
-    table.add_column("Phone", style="green")
-    table.add_column("Email", style="blue")
-    table.add_column("Birthday", style="yellow")
-    table.add_column("Days to B-day", style="magenta")
-    table.add_column("Note", style="white")
-    table.add_column("Tag", style="red")
-
-    for name, record in book.data.items():
-        phones = ", ".join(p.value for p in record.phones)
-        email = record.email.value if record.email else "-"
-        bday_str = record.birthday.value if record.birthday else "-"
-        
-        if record.birthday:
-            d = record.days_to_birthday()
-            days_until = str(d) if d is not None else "-"
-        else:
-            days_until = "-"
-        
-        note_str = "\n".join(record.notes) if record.notes else "-"
-        tag_str = ", ".join(record.tags) if record.tags else "-"
-        
-        table.add_row(name, phones, email, bday_str, days_until, note_str, tag_str)
+    columns = [
+        ("Full Name", "name", "cyan"),
+        ("Phone", "phones", "green"),
+        ("Email", "email", "blue"),
+        ("Birthday", "birthday", "yellow"),
+        ("Days to B-day", "days_to_birthday", "magenta"),
+        ("Note", "notes", "white"),
+        ("Tag", "tags", "red"),
+    ]
+
+    def build_row(name: str) -> Optional[Tuple[Any, ...]]:
+        record = book.find(name)
+        if not record:
+            return None
+        phones = [p.value for p in record.phones]
+        email = record.email.value if record.email else None
+        bday_str = record.birthday.value if record.birthday else None
+        days_until = record.days_to_birthday() if record.birthday else None
+        return name, phones, email, bday_str, days_until, record.notes, record.tags
     
-    console.print(Align.center(table))
+    _print_rows("All Contacts Details", columns, book.data, len(book.data), view, build_row, center=True)
 
 
-@command("list", "List all contacts")
+@command("list", "List all contacts: list [--page N] [--limit N] [--format F]")
 def handle_list(book: AddressBook, args: List[str]) -> None:
-    if not book.data:
+    view = _pop_view(args)
+    if view is None:
+        return
+    if not book.data and view[0] == "rich":
         print_info("No contacts found.")
         return
-    _print_contacts_table(book.data)
+    _print_contacts_table(book, book.data, len(book.data), view)
 
 
-def _print_contacts_table(contacts_map: Dict) -> None:
-    table = Table(title="Contacts List")
-    table.add_column("Name", style="cyan")
-    table.add_column("Phones", style="green")
-    table.add_column("Email", style="blue")
-    table.add_column("Birthday", style="yellow")
+def _print_contacts_table(book: AddressBook, names: Iterable[str], total: int, view: View) -> None:
+    columns = [
+        ("Name", "name", "cyan"),
+        ("Phones", "phones", "green"),
+        ("Email", "email", "blue"),
+        ("Birthday", "birthday", "yellow"),
+    ]
 
-    for name, record in contacts_map.items():
-        phones = ", ".join(p.value for p in record.phones)
-        email = record.email.value if record.email else "-"
-        birthday = record.birthday.value if record.birthday else "-"
-        table.add_row(name, phones, email, birthday)
+    def build_row(name: str) -> Optional[Tuple[Any, ...]]:
+        record = book.find(name)
+        if not record:
+            return None
+        phones = [p.value for p in record.phones]
+        email = record.email.value if record.email else None
+        birthday = record.birthday.value if record.birthday else None
+        return name, phones, email, birthday
     
-    console.print(table)
+    _print_rows("Contacts List", columns, names, total, view, build_row)
+
+
+# --- Output Options & Rendering ---
+
+def _pop_option(args: List[str], option: str) -> Optional[str]:
+    """
+    Removes '--option value' or '--option=value' from args.
+    Returns the value, or None if the option is absent.
+    Raises ValueError if the value is missing.
+    """
+    flag = f"--{option}"
+    for i, arg in enumerate(args):
+        if arg == flag:
+            if i + 1 >= len(args):
+                raise ValueError(f"{flag} needs a value")
+            value = args[i + 1]
+            del args[i:i + 2]
+            return value
+        if arg.startswith(flag + "="):
+            del args[i]
+            return arg[len(flag) + 1:]
+    return None
+
+
+def _pop_format(args: List[str]) -> Optional[str]:
+    """
+    Pops --format from args: 'rich' (tables), 'tsv' or 'ndjson'.
+    Defaults to OUTPUT_FORMAT; prints an error and returns None if invalid.
+    """
+    try:
+        fmt = _pop_option(args, "format")
+    except ValueError:
+        fmt = ""
+    fmt = OUTPUT_FORMAT if fmt is None else fmt.lower()
+    if fmt != "rich" and fmt not in PLAIN_FORMATS:
+        print_error(f"--format must be one of: rich, {', '.join(PLAIN_FORMATS)}.")
+        return None
+    return fmt
+
+
+def _pop_view(args: List[str]) -> Optional[View]:
+    """
+    Pops --format, --page and --limit from args.
+    Rich tables default to pages of PAGE_SIZE rows; plain formats stream
+    every row unless --limit is given.
+    Prints an error and returns None if an option is invalid.
+    """
+    fmt = _pop_format(args)
+    if fmt is None:
+        return None
+    try:
+        page = _pop_option(args, "page")
+        limit = _pop_option(args, "limit")
+        page_number = int(page) if page is not None else 1
+        page_size = int(limit) if limit is not None else None
+    except ValueError:
+        print_error("--page and --limit must be positive numbers.")
+        return None
+    if page_number < 1 or (page_size is not None and page_size < 1):
+        print_error("--page and --limit must be positive numbers.")
+        return None
+    if page_size is None and (fmt == "rich" or page is not None):
+        page_size = PAGE_SIZE
+    return fmt, page_number, page_size
+
+
+def _print_rows(
+    title: str,
+    columns: Sequence[Column],
+    items: Iterable[Any],
+    total: int,
+    view: View,
+    build_row: Callable[[Any], Optional[Tuple[Any, ...]]],
+    center: bool = False
+) -> None:
+    """
+    Renders one page of 'items' as a rich table or plain rows.
+    Items before the page are skipped without being built, so only the
+    visible rows are materialized and formatted.
+    """
+    fmt, page_number, page_size = view
+    if page_size is None:
+        start, stop, pages = 0, None, 1
+    else:
+        pages = max(1, -(-total // page_size))
+        start = (page_number - 1) * page_size
+        stop = start + page_size
+        if page_number > pages and fmt == "rich":
+            print_info(f"Page {page_number} is out of range ({pages} pages).")
+            return
+
+    rows = (row for row in map(build_row, itertools.islice(items, start, stop)) if row is not None)
+
+    if fmt in PLAIN_FORMATS:
+        write_rows(fmt, [field for _, field, _ in columns], rows)
+        return
+
+    from rich.align import Align
+    from rich.table import Table
+
+    table = Table(title=title)
+    for heading, _, style in columns:
+        table.add_column(heading, style=style)
+    fields = [field for _, field, _ in columns]
+    for row in rows:
+        table.add_row(*(_cell(field, value) for field, value in zip(fields, row)))
+
+    if pages > 1:
+        table.caption = f"Page {page_number}/{pages} of {total} contacts (--page N, --limit N)"
+    console.print(Align.center(table) if center else table)
+
+
+def _cell(field: str, value: Any) -> str:
+    """Formats a raw row value for a table cell ('-' when empty)."""
+    if isinstance(value, (list, tuple)):
+        value = _CELL_SEPARATORS.get(field, ", ").join(value)
+    return "-" if value is None or value == "" else str(value)
 
 
 # --- NOTES MANAGEMENT ---
@@ -415,7 +546,7 @@ def handle_add_note(book: AddressBook, args: List[str]) -> None:
             raise KeyError
         record.add_note(note)
         print_success(random.choice(NOTE_ADDED_MESSAGES).format(name=name))
-        storage.save_all(book)
+        storage.save_changes(book)
     except KeyError:
         print_error(random.choice(CONTACT_NOT_FOUND_MESSAGES).format(name=name))
 
@@ -439,7 +570,7 @@ def handle_edit_note(book: AddressBook, args: List[str]) -> None:
         if 0 <= index < len(record.notes):
             record.edit_note(index, new_text)
             print_success(random.choice(NOTE_UPDATED_MESSAGES).format(name=name))
-            storage.save_all(book)
+            storage.save_changes(book)
         else:
             print_error(random.choice(INVALID_INDEX_MESSAGES))
     except ValueError:
@@ -462,14 +593,10 @@ def handle_delete_note(book: AddressBook, args: List[str]) -> None:
         if not record:
              raise KeyError
         
-        # Use remove_note if available, otherwise pop
-        if hasattr(record, 'remove_note'):
-             record.remove_note(index)
-        else:
-             record.notes.pop(index)
+        record.remove_note(index)
         
         print_success(random.choice(NOTE_DELETED_MESSAGES).format(name=name))
-        storage.save_all(book)
+        storage.save_changes(book)
     except ValueError:
         print_error("Index must be a number.")
     except (KeyError, IndexError):
@@ -485,11 +612,10 @@ def handle_search_notes(book: AddressBook, args: List[str]) -> None:
     query = args[0].lower()
     found = False
     
-    for name, record in book.data.items():
-        for i, note in enumerate(record.notes):
-            if query in note.lower():
-                console.print(f"[bold cyan]{name}[/bold cyan] (Note {i+1}): {note}")
-                found = True
+    for name, i in book.search_notes(query):
+        note = book.find(name).notes[i]
+        console.print(f"[bold cyan]{name}[/bold cyan] (Note {i+1}): {note}")
+        found = True
     
     if not found:
         print_info(f"No notes found matching '{query}'")
@@ -501,7 +627,7 @@ def handle_list_notes(book: AddressBook, args: List[str]) -> None:
     
     if name:
         record = book.find(name)
-        results = record.notes if record else []
+        results = record.notes if record else ()
     else:
         results = {n: r.notes for n, r in book.data.items() if r.notes}
     
@@ -509,7 +635,7 @@ def handle_list_notes(book: AddressBook, args: List[str]) -> None:
         print_info(f"No notes found{' for ' + name if name else ''}.")
         return
 
-    if isinstance(results, list): # Single contact
+    if isinstance(results, tuple): # Single contact
          console.print(f"[bold]Notes for {name}:[/bold]")
          for i, note in enumerate(results, 1):
              console.print(f"{i}. {note}")
@@ -537,7 +663,7 @@ def handle_add_tag(book: AddressBook, args: List[str]) -> None:
             raise KeyError
         record.add_tag(tag)
         print_success(random.choice(TAG_ADDED_MESSAGES).format(name=name, tag=tag))
-        storage.save_all(book)
+        storage.save_changes(book)
     except KeyError:
         print_error(random.choice(CONTACT_NOT_FOUND_MESSAGES).format(name=name))
 
@@ -554,13 +680,19 @@ def handle_remove_tag(book: AddressBook, args: List[str]) -> None:
     record = book.find(name)
     if record:
         record.remove_tag(tag)
-        storage.save_all(book)
+        storage.save_changes(book)
     print_success(random.choice(TAG_REMOVED_MESSAGES).format(name=name))
 
 
-@command("list_tags", "List all tags")
+@command("list_tags", "List all tags: list_tags [--format F]")
 def handle_list_tags(book: AddressBook, args: List[str]) -> None:
+    fmt = _pop_format(args)
+    if fmt is None:
+        return
     results = book.get_all_tags()
+    if fmt in PLAIN_FORMATS:
+        write_rows(fmt, ["name", "tags"], ((name, t_list) for name, t_list in results.items() if t_list))
+        return
     if not results:
         print_info("No tags found.")
         return
@@ -570,47 +702,44 @@ def handle_list_tags(book: AddressBook, args: List[str]) -> None:
             console.print(f"[bold]{name}[/bold]: {', '.join(t_list)}")
 
 
-@command("filter_by_tag", "Find contacts by tag: filter_by_tag <tag>")
+@command("filter_by_tag", "Find contacts by tag: filter_by_tag <tag> [--page N] [--limit N] [--format F]")
 def handle_filter_by_tag(book: AddressBook, args: List[str]) -> None:
+    view = _pop_view(args)
+    if view is None:
+        return
     if not args:
         print_error(random.choice(MISSING_ARGS_MESSAGES).format(syntax="filter_by_tag <tag>"))
         return
     
     tag = " ".join(args)
     names = book.find_by_tag(tag)
-    if not names:
+    if not names and view[0] == "rich":
         print_info(f"No contacts found with tag '{tag}'")
         return
 
-    table = Table(title=f"Contacts with Tag: {tag}")
-    table.add_column("Tag", style="red")
-    table.add_column("Full Name", style="cyan")
-    table.add_column("Days to B-day", style="magenta")
-    table.add_column("Phone", style="green")
-    table.add_column("Email", style="blue")
-    table.add_column("Birthday", style="yellow")
-    table.add_column("Note", style="white")
-
-    for name in names:
+    columns = [
+        ("Tag", "tag", "red"),
+        ("Full Name", "name", "cyan"),
+        ("Days to B-day", "days_to_birthday", "magenta"),
+        ("Phone", "phones", "green"),
+        ("Email", "email", "blue"),
+        ("Birthday", "birthday", "yellow"),
+        ("Note", "notes", "white"),
+    ]
+
+    def build_row(name: str) -> Optional[Tuple[Any, ...]]:
         record = book.find(name)
         if not record: 
-            continue
+            return None
             
-        phones = ", ".join(p.value for p in record.phones)
-        email = record.email.value if record.email else "-"
-        bday = record.birthday.value if record.birthday else "-"
-        
-        if record.birthday:
-            d = record.days_to_birthday()
-            days_until = str(d) if d is not None else "-"
-        else:
-            days_until = "-"
-        
-        note_str = "\n".join(record.notes) if record.notes else "-"
+        phones = [p.value for p in record.phones]
+        email = record.email.value if record.email else None
+        bday = record.birthday.value if record.birthday else None
+        days_until = record.days_to_birthday() if record.birthday else None
         
-        table.add_row(tag, name, days_until, phones, email, bday, note_str)
+        return tag, name, days_until, phones, email, bday, record.notes
     
-    console.print(Align.center(table))
+    _print_rows(f"Contacts with Tag: {tag}", columns, names, len(names), view, build_row, center=True)
 
 
 # --- BIRTHDAYS ---
@@ -639,8 +768,11 @@ def handle_days_to_bday(book: AddressBook, args: List[str]) -> None:
         print_warning(f"No birthday set for {name}")
 
 
-@command("birthdays", "Upcoming birthdays: birthdays [days]")
+@command("birthdays", "Upcoming birthdays: birthdays [days] [--format F]")
 def handle_birthdays(book: AddressBook, args: List[str]) -> None:
+    fmt = _pop_format(args)
+    if fmt is None:
+        return
     days = DEFAULT_BIRTHDAY_LOOKAHEAD_DAYS
     if args:
         try:
@@ -650,44 +782,36 @@ def handle_birthdays(book: AddressBook, args: List[str]) -> None:
             return
             
     upcoming = book.get_upcoming_birthdays(days)
-    if not upcoming:
+    if not upcoming and fmt == "rich":
         print_info(f"No birthdays in the next {days} days.")
         return
 
-    console.print(f"[bold]Birthdays in the next {days} days:[/bold]")
+    if fmt == "rich":
+        console.print(f"[bold]Birthdays in the next {days} days:[/bold]")
     
-    table = Table(title=f"Upcoming Birthdays (Next {days} days)")
-    table.add_column("Birthday", style="yellow")
-    table.add_column("Days to B-day", style="magenta")
-    table.add_column("Full Name", style="cyan")
-    table.add_column("Tag", style="red")
-    table.add_column("Phone", style="green")
-    table.add_column("Email", style="blue")
-    table.add_column("Note", style="white")
+    columns = [
+        ("Birthday", "birthday", "yellow"),
+        ("Days to B-day", "days_to_birthday", "magenta"),
+        ("Full Name", "name", "cyan"),
+        ("Tag", "tags", "red"),
+        ("Phone", "phones", "green"),
+        ("Email", "email", "blue"),
+        ("Note", "notes", "white"),
+    ]
     
-    for item in upcoming:
+    def build_row(item: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
         name = item['name']
         record = book.find(name)
         if not record:
-            continue
+            return None
             
-        phones = ", ".join(p.value for p in record.phones)
-        email = record.email.value if record.email else "-"
-        
-        note_str = "\n".join(record.notes) if record.notes else "-"
-        tag_str = ", ".join(record.tags) if record.tags else "-"
+        phones = [p.value for p in record.phones]
+        email = record.email.value if record.email else None
         
-        table.add_row(
-            item['birthday'], 
-            str(item['days_until']), 
-            name,
-            tag_str,
-            phones, 
-            email, 
-            note_str
-        )
+        return item['birthday'], item['days_until'], name, record.tags, phones, email, record.notes
         
-    console.print(Align.center(table))
+    _print_rows(f"Upcoming Birthdays (Next {days} days)", columns, upcoming, len(upcoming),
+                (fmt, 1, None), build_row, center=True)
 
 
 # --- IMPORT/EXPORT ---
@@ -698,10 +822,29 @@ def handle_import(book: AddressBook, args: List[str]) -> None:
         print_error(random.choice(MISSING_ARGS_MESSAGES).format(syntax="import <path>"))
         return
     
+    from assistant_bot import import_export
+
     path = args[0]
+    started = time.perf_counter()
+    imported_rows = 0
+
     try:
-        import_export.import_file(book, path)
+        with console.status(f"Importing {path}...") as status:
+            def report(rows: int, bytes_read: int) -> None:
+                nonlocal imported_rows
+                imported_rows = rows
+                elapsed = max(time.perf_counter() - started, 1e-9)
+                status.update(
+                    f"Importing {path}: {rows:,} rows, {bytes_read / 1_048_576:,.1f} MiB "
+                    f"({rows / elapsed:,.0f} rows/s)"
+                )
+
+            import_export.import_file(book, path, progress=report)
+
+        elapsed = max(time.perf_counter() - started, 1e-9)
         print_success(random.choice(IMPORT_SUCCESS_MESSAGES).format(path=path))
+        print_info(f"{imported_rows:,} rows in {elapsed:.1f}s ({imported_rows / elapsed:,.0f} rows/s)")
+        storage.save_changes(book)
     except Exception as e:
         print_error(f"Import failed: {e}")
 
@@ -712,6 +855,8 @@ def handle_export(book: AddressBook, args: List[str]) -> None:
         print_error(random.choice(MISSING_ARGS_MESSAGES).format(syntax="export <path>"))
         return
     
+    from assistant_bot import import_export
+
     path = args[0]
     try:
         import_export.export_file(book, path)
@@ -720,19 +865,94 @@ def handle_export(book: AddressBook, args: List[str]) -> None:
         print_error(f"Export failed: {e}")
 
 
-@command("delete_all", "Delete ALL content: delete_all")
+@command("delete_all", "Delete ALL content: delete_all [YES]")
 def handle_delete_all(book: AddressBook, args: List[str]) -> None:
-    console.print("[bold red]⚠️  WARNING: This will delete ALL contacts, notes, and tags![/bold red]")
-    confirm = console.input("[bold yellow]Are you sure? Type 'YES' to confirm: [/bold yellow]")
-    
+    if args:
+        confirm = args[0]
+    elif not _interactive:
+        print_error("Scripts must confirm explicitly: delete_all YES")
+        return
+    else:
+        console.print("[bold red]⚠️  WARNING: This will delete ALL contacts, notes, and tags![/bold red]")
+        confirm = console.input("[bold yellow]Are you sure? Type 'YES' to confirm: [/bold yellow]")
+
     if confirm == "YES":
-        book.data.clear()
+        book.clear()
         print_success(random.choice(DELETE_ALL_MESSAGES))
         storage.save_all(book)
     else:
         print_info("Operation canceled. Your data is safe.")
 
 
+# --- DIAGNOSTICS ---
+
+@command("stats", "Timings & counters: stats [reset] [--format F] | stats capture <cprofile|tracemalloc> <file> | stats capture stop")
+def handle_stats(book: AddressBook, args: List[str]) -> None:
+    if args[:1] == ["reset"]:
+        stats.reset()
+        print_success("Statistics reset.")
+        return
+    if args[:1] == ["capture"]:
+        _handle_capture(args[1:])
+        return
+
+    fmt = _pop_format(args)
+    if fmt is None:
+        return
+    rows = stats.rows()
+    if not rows and fmt == "rich":
+        print_info("No statistics yet.")
+        return
+
+    columns = [
+        ("Group", "group", "magenta"),
+        ("Name", "name", "cyan"),
+        ("Calls", "calls", "white"),
+        ("Total ms", "total_ms", "yellow"),
+        ("Mean ms", "mean_ms", "yellow"),
+        ("Max ms", "max_ms", "red"),
+        ("Histogram", "histogram", "green"),
+    ]
+    labels = [f"<{_duration_label(bound)}" for bound in stats.TIMING_BUCKETS]
+    labels.append(f">={_duration_label(stats.TIMING_BUCKETS[-1])}")
+
+    def build_row(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        group, name, calls, total_ms, max_ms, buckets = row
+        if total_ms is None:
+            return group, name, calls, None, None, None, None
+        histogram = [f"{label}:{n}" for label, n in zip(labels, buckets) if n]
+        return group, name, calls, round(total_ms, 3), round(total_ms / calls, 3), round(max_ms, 3), histogram
+
+    _print_rows("Runtime Statistics", columns, rows, len(rows), (fmt, 1, None), build_row)
+    capture = stats.capture_status()
+    if capture and fmt == "rich":
+        print_info(f"{capture[0]} capture running, writing {capture[1]} on 'stats capture stop'.")
+
+
+def _handle_capture(args: List[str]) -> None:
+    if args[:1] == ["stop"]:
+        path = stats.stop_capture()
+        if path:
+            print_success(f"Capture written to {path}")
+        else:
+            print_info("No capture is running.")
+        return
+
+    if len(args) < 2:
+        print_error(random.choice(MISSING_ARGS_MESSAGES).format(syntax="stats capture <cprofile|tracemalloc> <file>"))
+        return
+    try:
+        stats.start_capture(args[0].lower(), args[1])
+    except ValueError as e:
+        print_error(str(e))
+        return
+    print_success(f"{args[0].lower()} capture started; 'stats capture stop' writes {args[1]}.")
+
+
+def _duration_label(seconds: float) -> str:
+    return f"{seconds:g}s" if seconds >= 1 else f"{seconds * 1000:g}ms"
+
+
 @command("exit", "Exit the application")
 def handle_exit(book: AddressBook, args: List[str]) -> None:
     pass
@@ -744,9 +964,27 @@ def handle_close(book: AddressBook, args: List[str]) -> None:
 
 # --- Parser & Dispatcher ---
 
+def _split_quoted(raw: str) -> Optional[List[str]]:
+    """Splits like shlex.split for lines without escapes; None if the line needs shlex."""
+    parts = []
+    for match in _QUOTED_TOKEN_RE.finditer(raw):
+        word, other = match.groups()
+        if other is not None:
+            return None
+        if word is not None:
+            parts.append(_QUOTES_RE.sub(r"\1\2", word))
+    return parts
+
+
 def parse(raw: str) -> Tuple[Optional[str], List[str]]:
     try:
-        parts = shlex.split(raw)
+        # shlex is only needed for escapes and unclosed quotes; most lines have neither
+        if '"' in raw or "'" in raw or "\\" in raw:
+            parts = _split_quoted(raw)
+            if parts is None:
+                parts = shlex.split(raw)
+        else:
+            parts = _PLAIN_TOKEN_RE.findall(raw)
         if not parts:
             return None, []
         return parts[0].lower(), parts[1:]
@@ -754,7 +992,12 @@ def parse(raw: str) -> Tuple[Optional[str], List[str]]:
         return None, []
 
 def dispatch(book: AddressBook, raw_input: str) -> bool:
-    """Parses and executes a command."""
+    """
+    Parses and executes a command.
+    The time of every registered command (parsing and waiting for the
+    storage lock included) goes to the stats command timings.
+    """
+    started = time.perf_counter()
     cmd, args = parse(raw_input)
     
     if not cmd:
@@ -766,12 +1009,51 @@ def dispatch(book: AddressBook, raw_input: str) -> bool:
     if cmd in COMMAND_REGISTRY:
         handler, _ = COMMAND_REGISTRY[cmd]
         try:
-            handler(book, args)
+            waited = time.perf_counter()
+            with storage.locked():
+                stats.add_time(stats.sections, "lock_wait", time.perf_counter() - waited)
+                with stats.profiled():
+                    handler(book, args)
         except Exception as e:
             # We print the error but keep the bot alive
             print_error(f"Error executing '{cmd}': {e}")
+        finally:
+            stats.add_time(stats.commands, cmd, time.perf_counter() - started)
     else:
         msg = random.choice(UNKNOWN_COMMAND_MESSAGES).format(cmd=cmd)
         print_error(msg)
     
     return True
+
+
+def run_batch(book: AddressBook, lines: Iterable[str], stop_on_error: bool = False) -> Tuple[int, List[BatchFailure]]:
+    """
+    Runs command lines without the prompt (main.py --script).
+    Blank lines and '#' comments are skipped and 'exit'/'close' ends the
+    batch. Changes are persisted once, when the batch ends, instead of in
+    the background while it runs. A line fails if it printed an error;
+    the last error it printed is kept for the summary.
+    Commands that would prompt for input (delete_all) fail instead.
+    Returns (commands run, failed lines).
+    """
+    global _interactive
+    executed = 0
+    failures: List[BatchFailure] = []
+    _interactive = False
+    try:
+        with storage.deferred():
+            for number, line in enumerate(lines, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                errors = errors_printed()
+                if not dispatch(book, line):
+                    break
+                executed += 1
+                if errors_printed() != errors:
+                    failures.append((number, line, last_error()))
+                    if stop_on_error:
+                        break
+    finally:
+        _interactive = True
+    return executed, failures
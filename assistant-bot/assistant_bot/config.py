@@ -2,15 +2,49 @@ import os
 
 # Base paths
 ROOT_DIR = os.path.dirname(os.path.dirname(__file__))
-DATA_DIR = os.path.join(ROOT_DIR, 'user_address_book')
+# ASSISTANT_BOT_DATA_DIR keeps the contacts elsewhere (e.g. for benchmark runs)
+DATA_DIR = os.environ.get('ASSISTANT_BOT_DATA_DIR') or os.path.join(ROOT_DIR, 'user_address_book')
 
 # Persistent Storage Paths
 JSON_STORAGE_PATH = os.path.join(DATA_DIR, 'contacts.json')
 CSV_STORAGE_PATH = os.path.join(DATA_DIR, 'contacts.csv')
 PICKLE_STORAGE_PATH = os.path.join(DATA_DIR, 'contacts.pkl')
+JOURNAL_STORAGE_PATH = os.path.join(DATA_DIR, 'contacts.journal')
+SNAPSHOT_STORAGE_PATH = os.path.join(DATA_DIR, 'contacts.snap')
+MANIFEST_STORAGE_PATH = os.path.join(DATA_DIR, 'manifest.json')
+
+# JSON layout for contacts.json and JSON exports:
+# 'compact' (streamed, no indentation) or 'pretty' (indent=2, human friendly)
+JSON_STORAGE_FORMAT = 'compact'
+
+# In-memory backend: 'dict' (Record objects and indexes) or 'columnar' (packed
+# parallel arrays; queries scan them, using less memory but slower than the indexes)
+ADDRESS_BOOK_BACKEND = 'dict'
+
+# Journal Compaction (folds the journal back into the full snapshots)
+JOURNAL_COMPACT_THRESHOLD = 1000      # journal entries
+JOURNAL_COMPACT_INTERVAL = 300        # seconds
+
+# Background Persistence (change signals arriving within this window share one write)
+PERSIST_DEBOUNCE_SECONDS = 0.25
+
+# Import (files at least this large are validated by a process pool)
+IMPORT_WORKERS = None                 # worker processes; None = os.cpu_count()
+IMPORT_PARALLEL_MIN_BYTES = 8 * 1024 * 1024
 
 # Feature Configuration
 DEFAULT_BIRTHDAY_LOOKAHEAD_DAYS = 21
+SEARCH_RANK_RESULTS = False           # list name matches before phone/email matches
+PAGE_SIZE = 50                        # rows per page in list, all, search and filter_by_tag
+
+# Listing output: 'rich' (tables) or plain rows for scripts and pipes, 'tsv' or 'ndjson'.
+# Commands that list contacts also take a per-call '--format'.
+OUTPUT_FORMAT = 'rich'
+
+# Profiling: capture from startup with 'cprofile' or 'tracemalloc' (None = off).
+# The capture is written to PROFILE_CAPTURE_PATH on exit; 'stats capture' starts one at runtime.
+PROFILE_CAPTURE = os.environ.get('ASSISTANT_BOT_CAPTURE') or None
+PROFILE_CAPTURE_PATH = os.path.join(DATA_DIR, 'capture.out')
 
 # UX Configuration
 AUTO_HELP_THRESHOLD = 6
@@ -1,8 +1,17 @@
+import os
+import re
+import itertools
 import json
 import csv
-from typing import Dict, Any, List
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from datetime import date, datetime
+from typing import Dict, Any, Deque, List, Callable, Iterable, Iterator, Optional, TextIO, Tuple
 
+from assistant_bot.config import IMPORT_WORKERS, IMPORT_PARALLEL_MIN_BYTES, JSON_STORAGE_FORMAT
 from assistant_bot.models import Record, AddressBook
+from assistant_bot.utils.atomic import atomic_write
+from assistant_bot.utils.validators import normalize_phones, validate_emails
 
 # Constants
 CSV_HEADERS = ['name', 'phones', 'email', 'birthday', 'notes', 'tags']
@@ -12,6 +21,23 @@ CSV_DELIMITERS = {
     'tags': ','
 }
 
+# Streaming import tuning
+IMPORT_BATCH_SIZE = 1000          # records added to the book (and reported) per batch
+JSON_READ_CHUNK_SIZE = 1 << 16    # characters read per refill of the JSON parser
+JSON_WRITE_BATCH_SIZE = 1000      # entries encoded per write in compact JSON mode
+PARALLEL_CHUNK_SIZE = 5000        # entries validated per worker task
+PARALLEL_CHUNKS_PER_WORKER = 2    # tasks in flight per worker (bounds memory)
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# progress(rows_processed, bytes_read); called once per batch and at the end.
+ProgressCallback = Callable[[int, int], None]
+
+Entry = Tuple[str, Dict[str, Any]]
+# Validated contact as sent back by import workers:
+# (name, phones, email, birthday ordinal or 0, notes, tags)
+NormalizedRow = Tuple[str, Tuple[str, ...], Optional[str], int, Tuple[str, ...], Tuple[str, ...]]
+
 
 def export_file(address_book: AddressBook, path: str) -> None:
     """Exports AddressBook data to a file (JSON or CSV)."""
@@ -28,53 +54,104 @@ def export_file(address_book: AddressBook, path: str) -> None:
         raise ValueError('Unsupported export format')
 
 
-def import_file(address_book: AddressBook, path: str) -> None:
-    """Imports data from a file (JSON or CSV) into AddressBook."""
+def import_file(
+    address_book: AddressBook,
+    path: str,
+    progress: Optional[ProgressCallback] = None,
+    workers: Optional[int] = None
+) -> None:
+    """
+    Imports data from a file (JSON or CSV) into AddressBook.
+    Both formats are streamed, so memory stays flat regardless of file size.
+    'progress' is called with (rows processed, bytes read) after every batch.
+
+    With 'workers' > 1, entries are validated in chunks by a process pool and
+    merged here in file order, so a name repeated in the file resolves to its
+    last valid row exactly as in a sequential import. By default the pool is
+    used (IMPORT_WORKERS processes) for files of IMPORT_PARALLEL_MIN_BYTES or more.
+    """
     if not path:
         raise ValueError('Path required')
     
     extension = path.lower().split('.')[-1]
     
     if extension == 'json':
-        _import_json(address_book, path)
+        open_args: Dict[str, Any] = {}
+        iter_entries = _iter_json_entries
     elif extension == 'csv':
-        _import_csv(address_book, path)
+        open_args = {'newline': ''}
+        iter_entries = _iter_csv_entries
     else:
         raise ValueError('Unsupported import format')
 
+    if workers is None:
+        workers = IMPORT_WORKERS or os.cpu_count() or 1
+        if os.path.getsize(path) < IMPORT_PARALLEL_MIN_BYTES:
+            workers = 1
+
+    with open(path, 'r', encoding='utf-8', **open_args) as f:
+        entries = iter_entries(f)
+        bytes_read = lambda: f.buffer.tell()
+        if workers > 1:
+            _load_parallel(address_book, entries, bytes_read, progress, workers)
+        else:
+            _load_batches(address_book, entries, bytes_read, progress)
+
+
+def write_json_object(
+    f: TextIO,
+    items: Iterable[Tuple[str, Any]],
+    compact: bool = JSON_STORAGE_FORMAT == 'compact'
+) -> None:
+    """
+    Writes a JSON object from a stream of (key, value) pairs (keys must be unique).
+    Compact mode encodes JSON_WRITE_BATCH_SIZE pairs at a time with the C
+    encoder, so the full object is never built in memory; pretty mode uses indent=2.
+    """
+    if not compact:
+        json.dump(dict(items), f, ensure_ascii=False, indent=2)
+        return
+
+    encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+    items = iter(items)
+    opening = '{'
+    while True:
+        batch = dict(itertools.islice(items, JSON_WRITE_BATCH_SIZE))
+        if not batch:
+            break
+        # Splice the batch's members into the enclosing object.
+        f.write(opening + encode(batch)[1:-1])
+        opening = ','
+    f.write('{}' if opening == '{' else '}')
+
 
 # --- Internal Helpers ---
 
-def _prepare_export_data(address_book: AddressBook) -> Dict[str, Any]:
-    """Converts AddressBook to a serializable dictionary."""
-    export_data = {}
-    for name, record in address_book.data.items():
-        export_data[name] = {
-            "phones": [p.value for p in record.phones],
-            "email": record.email.value if record.email else "",
-            "birthday": record.birthday.value if record.birthday else "",
-            "notes": record.notes,
-            "tags": record.tags
+def _iter_export_entries(address_book: AddressBook) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yields (name, serializable entry) pairs for export."""
+    for name, phones, email, birthday, notes, tags in address_book.iter_rows():
+        yield name, {
+            "phones": phones,
+            "email": email or "",
+            "birthday": birthday or "",
+            "notes": notes,
+            "tags": tags
         }
-    return export_data
 
 
 def _export_json(address_book: AddressBook, path: str) -> None:
     """Writes data to a JSON file."""
-    data = _prepare_export_data(address_book)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with atomic_write(path, 'w', encoding='utf-8') as f:
+        write_json_object(f, _iter_export_entries(address_book))
 
 
 def _export_csv(address_book: AddressBook, path: str) -> None:
     """Writes data to a CSV file."""
-    data = _prepare_export_data(address_book)
-    
-    with open(path, 'w', newline='', encoding='utf-8') as f:
+    with atomic_write(path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
         writer.writerow(CSV_HEADERS)
         
-        for name, entry in data.items():
+        for name, entry in _iter_export_entries(address_book):
             phones = CSV_DELIMITERS['phones'].join(entry['phones'])
             notes = CSV_DELIMITERS['notes'].join(entry['notes'])
             tags = CSV_DELIMITERS['tags'].join(entry['tags'])
@@ -89,67 +166,237 @@ def _export_csv(address_book: AddressBook, path: str) -> None:
             ])
 
 
-def _import_json(address_book: AddressBook, path: str) -> None:
-    """Reads data from a JSON file and populates AddressBook."""
-    with open(path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-        
-    for name, entry in data.items():
-        if isinstance(entry, dict):
-            _create_record_from_entry(address_book, name, entry)
-
-
-def _import_csv(address_book: AddressBook, path: str) -> None:
-    """Reads data from a CSV file and populates AddressBook."""
-    with open(path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            name = row.get('name')
-            if not name:
-                continue
-            
-            # Helper to split fields safely
-            def split_field(key: str, delimiter: str) -> List[str]:
-                val = row.get(key, '')
-                return [item for item in val.split(delimiter) if item] if val else []
-
-            entry = {
-                'phones': split_field('phones', CSV_DELIMITERS['phones']),
-                'email': row.get('email', ''),
-                'birthday': row.get('birthday', ''),
-                'notes': split_field('notes', CSV_DELIMITERS['notes']),
-                'tags': split_field('tags', CSV_DELIMITERS['tags'])
-            }
-            
-            _create_record_from_entry(address_book, name, entry)
+def _load_batches(
+    address_book: AddressBook,
+    entries: Iterator[Entry],
+    bytes_read: Callable[[], int],
+    progress: Optional[ProgressCallback]
+) -> None:
+    """Validates streamed entries and adds them to the book in batches."""
+    rows = 0
+    batch: List[Entry] = []
 
+    for entry in entries:
+        rows += 1
+        batch.append(entry)
 
-def _create_record_from_entry(address_book: AddressBook, name: str, entry: Dict[str, Any]) -> None:
-    """Helper to create and add a Record from a data dictionary."""
-    try:
-        record = Record(name)
-        
-        for phone in entry.get('phones', []):
-            record.add_phone(str(phone))
-            
-        email = entry.get('email')
-        if email:
-            record.add_email(str(email))
-            
+        if rows % IMPORT_BATCH_SIZE == 0:
+            _add_rows(address_book, _normalize_chunk(batch))
+            batch.clear()
+            if progress:
+                progress(rows, bytes_read())
+
+    _add_rows(address_book, _normalize_chunk(batch))
+    if progress:
+        progress(rows, bytes_read())
+
+
+def _add_rows(address_book: AddressBook, rows: Iterable[NormalizedRow]) -> None:
+    for name, phones, email, ordinal, notes, tags in rows:
+        address_book.add_record(Record.from_trusted(
+            name,
+            phones=phones,
+            email=email,
+            birthday=date.fromordinal(ordinal) if ordinal else None,
+            notes=notes,
+            tags=tags
+        ))
+
+
+# --- Parallel Import ---
+
+def _load_parallel(
+    address_book: AddressBook,
+    entries: Iterator[Entry],
+    bytes_read: Callable[[], int],
+    progress: Optional[ProgressCallback],
+    workers: int
+) -> None:
+    """
+    Parses entries here, validates them in worker processes and merges the
+    results in submission order. At most PARALLEL_CHUNKS_PER_WORKER chunks
+    per worker are in flight, so memory stays bounded.
+    """
+    rows = 0
+    pending: Deque[Tuple[int, Future]] = deque()
+    max_pending = workers * PARALLEL_CHUNKS_PER_WORKER
+
+    def merge_oldest() -> None:
+        nonlocal rows
+        size, future = pending.popleft()
+        _add_rows(address_book, future.result())
+        rows += size
+        if progress:
+            progress(rows, bytes_read())
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunk: List[Entry] = []
+        for entry in entries:
+            chunk.append(entry)
+            if len(chunk) == PARALLEL_CHUNK_SIZE:
+                pending.append((len(chunk), executor.submit(_normalize_chunk, chunk)))
+                chunk = []
+                if len(pending) >= max_pending:
+                    merge_oldest()
+        if chunk:
+            pending.append((len(chunk), executor.submit(_normalize_chunk, chunk)))
+        while pending:
+            merge_oldest()
+
+    if progress and not rows:
+        progress(rows, bytes_read())
+
+
+def _normalize_chunk(chunk: List[Entry]) -> List[NormalizedRow]:
+    """
+    Validates a chunk of entries, dropping invalid ones (also the worker task).
+    Phones and emails of the whole chunk go through the batch validators at
+    once; the rules are the same as for Record's setters.
+    """
+    raw_phones = [[str(phone) for phone in entry.get('phones', [])] for _, entry in chunk]
+    emails = [str(entry['email']) if entry.get('email') else '' for _, entry in chunk]
+    phones_iter = iter(normalize_phones(itertools.chain.from_iterable(raw_phones)))
+    emails_valid = validate_emails(emails)
+
+    normalized = []
+    for (name, entry), entry_phones, email, email_valid in zip(chunk, raw_phones, emails, emails_valid):
+        phones = tuple(itertools.islice(phones_iter, len(entry_phones)))
+        if not name or None in phones or (email and not email_valid):
+            continue
+
+        ordinal = 0
         birthday = entry.get('birthday')
         if birthday:
-            record.add_birthday(str(birthday))
-            
-        for note in entry.get('notes', []):
-            record.add_note(str(note))
-            
-        for tag in entry.get('tags', []):
-            record.add_tag(str(tag))
-            
-        address_book.add_record(record)
-    except ValueError:
-        # Skip invalid records (standard behavior akin to storage loading)
-        pass
+            try:
+                ordinal = _birthday_ordinal(str(birthday))
+            except ValueError:
+                continue
+
+        tags = (Record._normalize_tag(str(tag)) for tag in entry.get('tags', []))
+        normalized.append((
+            name,
+            phones,
+            email or None,
+            ordinal,
+            tuple(note for note in map(str, entry.get('notes', [])) if note),
+            tuple(dict.fromkeys(tag for tag in tags if tag))
+        ))
+    return normalized
+
+
+def _birthday_ordinal(value: str) -> int:
+    """Parses a DD-MM-YYYY birthday; the canonical spelling skips strptime."""
+    if len(value) == 10 and value[2] == value[5] == '-' and value.isascii() and value.replace('-', '').isdigit():
+        return date(int(value[6:]), int(value[3:5]), int(value[:2])).toordinal()
+    return datetime.strptime(value, "%d-%m-%Y").toordinal()
+
+
+def _iter_csv_entries(f: TextIO) -> Iterator[Entry]:
+    """Yields (name, entry) per CSV row, resolving column positions once from the header."""
+    reader = csv.reader(f)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    columns = {key: i for i, key in enumerate(header)}
+    name_col = columns.get('name')
+    if name_col is None:
+        return
+
+    def column(key: str) -> Callable[[List[str]], str]:
+        i = columns.get(key)
+        if i is None:
+            return lambda row: ''
+        return lambda row: row[i] if i < len(row) else ''
+
+    get_phones, get_email, get_birthday = column('phones'), column('email'), column('birthday')
+    get_notes, get_tags = column('notes'), column('tags')
+    phone_sep, note_sep, tag_sep = CSV_DELIMITERS['phones'], CSV_DELIMITERS['notes'], CSV_DELIMITERS['tags']
+
+    for row in reader:
+        name = row[name_col] if name_col < len(row) else ''
+        if not name:
+            continue
+
+        phones, notes, tags = get_phones(row), get_notes(row), get_tags(row)
+        yield name, {
+            'phones': [item for item in phones.split(phone_sep) if item] if phones else [],
+            'email': get_email(row),
+            'birthday': get_birthday(row),
+            'notes': [item for item in notes.split(note_sep) if item] if notes else [],
+            'tags': [item for item in tags.split(tag_sep) if item] if tags else []
+        }
+
+
+def _iter_json_entries(f: TextIO) -> Iterator[Entry]:
+    """
+    Incrementally parses a top-level JSON object {name: entry, ...}.
+    Only the current read chunk and one entry are held in memory.
+    """
+    decoder = json.JSONDecoder()
+    buf = ''
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        chunk = f.read(JSON_READ_CHUNK_SIZE)
+        if not chunk:
+            eof = True
+            return False
+        buf = buf[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_ws() -> str:
+        nonlocal pos
+        while True:
+            pos = _JSON_WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ''
+
+    def decode() -> Any:
+        nonlocal pos
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # A value ending exactly at the buffer edge may be cut short (e.g. a number).
+            if end == len(buf) and not eof and fill():
+                continue
+            pos = end
+            return value
+
+    if skip_ws() != '{':
+        raise ValueError('JSON import expects an object of contacts')
+    pos += 1
+
+    first = True
+    while True:
+        char = skip_ws()
+        if char == '}':
+            return
+        if not first:
+            if char != ',':
+                raise ValueError(f'Malformed JSON near position {pos}')
+            pos += 1
+            skip_ws()
+        first = False
+
+        name = decode()
+        if skip_ws() != ':':
+            raise ValueError(f'Malformed JSON near position {pos}')
+        pos += 1
+        skip_ws()
+        entry = decode()
+
+        if isinstance(name, str) and isinstance(entry, dict):
+            yield name, entry
 
 
-__all__ = ['export_file', 'import_file']
+__all__ = ['export_file', 'import_file', 'write_json_object']
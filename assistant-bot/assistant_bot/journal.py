@@ -0,0 +1,94 @@
+import os
+import json
+from typing import Any, Dict, Iterator, List
+
+from assistant_bot.config import JOURNAL_STORAGE_PATH
+from assistant_bot.utils.atomic import atomic_write
+
+__all__ = [
+    "OP_UPSERT",
+    "OP_DELETE",
+    "append_entries",
+    "read_entries",
+    "size",
+    "discard_prefix",
+    "reset",
+]
+
+# Journal operations
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+
+
+def append_entries(entries: List[Dict[str, Any]], path: str = JOURNAL_STORAGE_PATH) -> None:
+    """
+    Appends record-level operations to the write-ahead journal.
+    Each entry is written as one JSON line and flushed to disk before returning.
+    """
+    if not entries:
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = ''.join(
+        json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n'
+        for entry in entries
+    )
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_entries(path: str = JOURNAL_STORAGE_PATH) -> Iterator[Dict[str, Any]]:
+    """
+    Yields journal entries in the order they were written.
+    A torn trailing line (crash mid-append) is skipped.
+    """
+    if not os.path.exists(path):
+        return
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping corrupted journal entry: {line[:80]}")
+                continue
+            if isinstance(entry, dict):
+                yield entry
+
+
+def size(path: str = JOURNAL_STORAGE_PATH) -> int:
+    """Returns the journal length in bytes (0 if there is no journal)."""
+    try:
+        return os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+
+
+def discard_prefix(length: int, path: str = JOURNAL_STORAGE_PATH) -> None:
+    """
+    Discards the first 'length' bytes (as returned by size()) once they are
+    covered by a full snapshot. Entries appended after that point are kept.
+    """
+    if size(path) <= length:
+        reset(path)
+        return
+
+    with open(path, 'rb') as f:
+        f.seek(length)
+        tail = f.read()
+    with atomic_write(path, 'wb') as f:
+        f.write(tail)
+
+
+def reset(path: str = JOURNAL_STORAGE_PATH) -> None:
+    """Discards the journal once its entries are covered by a full snapshot."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
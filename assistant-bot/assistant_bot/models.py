@@ -1,21 +1,39 @@
+from calendar import isleap
 from collections import UserDict
-from datetime import datetime, date
-from typing import Optional, List, Any, Dict, Set
+from datetime import datetime, date, timedelta
+from typing import Optional, List, Any, Dict, Set, Tuple, Iterator, Iterable, Sequence, Union
 
-from assistant_bot.utils.validators import validate_phone, normalize_phone, validate_email
+from assistant_bot.utils import stats
+from assistant_bot.utils.validators import normalize_valid_phone, pack_phone, format_phone, format_birthday, validate_email
+from assistant_bot.search import SearchIndex
 
 
 class Field:
     """Base class for record fields."""
+    __slots__ = ('value',)
+
     def __init__(self, value: Any):
         self.value = value
 
     def __str__(self) -> str:
         return str(self.value)
 
+    @classmethod
+    def trusted(cls, value: Any) -> 'Field':
+        """Builds a field from an already validated value, skipping validation."""
+        field = cls.__new__(cls)
+        field.value = value
+        return field
+
+    def __setstate__(self, state: Any) -> None:
+        # Accepts slot state as well as legacy __dict__ pickles.
+        _restore_slots(self, state)
+
 
 class Name(Field):
     """Class for storing contact name. Mandatory field."""
+    __slots__ = ()
+
     def __init__(self, value: str):
         if not value:
             raise ValueError("Name cannot be empty.")
@@ -23,15 +41,43 @@ class Name(Field):
 
 
 class Phone(Field):
-    """Class for storing phone number. Validates format."""
+    """
+    Class for storing phone number. Validates format.
+    The number is stored packed as an int (the digits after '+'); 'value'
+    renders the normalized '+38...' string on access.
+    """
+    __slots__ = ('number',)
+
     def __init__(self, value: str):
-        if not validate_phone(value):
+        normalized = normalize_valid_phone(value)
+        if normalized is None:
             raise ValueError(f"Invalid phone number: {value}")
-        super().__init__(normalize_phone(value))
+        self.number = int(normalized[1:])
+
+    @property
+    def value(self) -> str:
+        return format_phone(self.number)
+
+    @classmethod
+    def trusted(cls, value: Union[str, int]) -> 'Phone':
+        """Builds a phone from a normalized '+38...' string or a packed number."""
+        phone = cls.__new__(cls)
+        phone.number = value if isinstance(value, int) else int(value[1:])
+        return phone
+
+    def __setstate__(self, state: Any) -> None:
+        if isinstance(state, tuple):
+            state = {**(state[0] or {}), **(state[1] or {})}
+        # Legacy pickles carry the normalized 'value' string instead of the number.
+        if 'value' in state:
+            state = {'number': int(state['value'][1:])}
+        _restore_slots(self, state)
 
 
 class Email(Field):
     """Class for storing email address. Validates format."""
+    __slots__ = ()
+
     def __init__(self, value: str):
         if not validate_email(value):
             raise ValueError(f"Invalid email: {value}")
@@ -39,13 +85,78 @@ class Email(Field):
 
 
 class Birthday(Field):
-    """Class for storing birthday. Validates format DD-MM-YYYY."""
+    """
+    Class for storing birthday. Validates format DD-MM-YYYY.
+    Only the date is stored; 'value' is rendered from it on access.
+    """
+    __slots__ = ('date_obj',)
+
     def __init__(self, value: str):
         try:
             self.date_obj = datetime.strptime(value, "%d-%m-%Y").date()
         except ValueError:
             raise ValueError("Invalid date format. Use DD-MM-YYYY")
-        super().__init__(value)
+
+    @property
+    def value(self) -> str:
+        return format_birthday(self.date_obj)
+
+    @classmethod
+    def trusted(cls, value: date) -> 'Birthday':
+        """Builds a birthday from an already parsed date."""
+        birthday = cls.__new__(cls)
+        birthday.date_obj = value
+        return birthday
+
+    def __setstate__(self, state: Any) -> None:
+        # Legacy pickles also carry the 'value' string; it is derived now.
+        _restore_slots(self, state, skip=('value',))
+
+
+def _restore_slots(obj: Any, state: Any, skip: Tuple[str, ...] = ()) -> None:
+    """Applies pickled state ((dict, slots) tuple or plain __dict__) to a slotted object."""
+    if isinstance(state, tuple):
+        legacy, slots = state
+        state = {**(legacy or {}), **(slots or {})}
+    for key, value in state.items():
+        if key not in skip:
+            setattr(obj, key, value)
+
+
+def next_birthday(born: date, today: date) -> date:
+    """
+    Returns the next occurrence of a birthday on or after 'today'.
+    A 29 February birthday falls on 28 February in common years.
+    """
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = date(year, born.month, born.day)
+        except ValueError:
+            candidate = date(year, 2, 28)
+        if candidate >= today:
+            return candidate
+    raise AssertionError("unreachable")
+
+
+def birthday_window(today: date, days: int) -> Iterator[Tuple[Tuple[int, int], int]]:
+    """
+    Yields ((month, day), days_until) for the birthdays celebrated within
+    'days' of 'today', walking the calendar forward.
+    """
+    started_on_feb29 = (today.month, today.day) == (2, 29)
+
+    # A next birthday is never more than 365 days away.
+    for offset in range(min(days, 365) + 1):
+        day = today + timedelta(days=offset)
+        if offset and (day.month, day.day) == (today.month, today.day):
+            break
+
+        yield (day.month, day.day), offset
+
+        # 29-Feb birthdays are celebrated on 28-Feb in common years
+        # (unless the walk started on 29-Feb and already yielded them).
+        if (day.month, day.day) == (2, 28) and not isleap(day.year) and not started_on_feb29:
+            yield (2, 29), offset
 
 
 class Record:
@@ -53,66 +164,136 @@ class Record:
     Class for storing contact information.
     Enforces strict encapsulation to prevent mutation hazards.
     """
+    # __weakref__: lazy backends keep weak references to the records they hand out.
+    __slots__ = ('name', '_phones', 'email', 'birthday', '_notes', '_tags', '_book', '__weakref__')
+
     def __init__(self, name: str):
         self.name = Name(name)
-        self._phones: List[Phone] = []
+        self._phones: Tuple[Phone, ...] = ()
         self.email: Optional[Email] = None
         self.birthday: Optional[Birthday] = None
-        self._notes: List[str] = []
-        self._tags: List[str] = []
+        self._notes: Tuple[str, ...] = ()
+        self._tags: Tuple[str, ...] = ()
+        # Owning AddressBook, set by AddressBook.add_record to keep its indexes in sync.
+        self._book: Optional['AddressBook'] = None
+
+    @classmethod
+    def from_trusted(
+        cls,
+        name: str,
+        phones: Iterable[Union[str, int]] = (),
+        email: Optional[str] = None,
+        birthday: Optional[date] = None,
+        notes: Iterable[str] = (),
+        tags: Iterable[str] = ()
+    ) -> 'Record':
+        """
+        Builds a Record from values that were validated and normalized before
+        (e.g. decoded from our own storage). Validators are not re-run.
+        """
+        record = cls.__new__(cls)
+        record.name = Name.trusted(name)
+        record._phones = tuple(map(Phone.trusted, phones))
+        record.email = Email.trusted(email) if email else None
+        record.birthday = Birthday.trusted(birthday) if birthday else None
+        record._notes = tuple(notes)
+        record._tags = tuple(tags)
+        record._book = None
+        return record
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The owning book is not part of the record; AddressBook relinks on unpickling.
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot not in ('_book', '__weakref__')}
+
+    def __setstate__(self, state: Any) -> None:
+        self._book = None
+        _restore_slots(self, state, skip=('_book',))
+        # Legacy pickles stored these as lists.
+        self._phones = tuple(self._phones)
+        self._notes = tuple(self._notes)
+        self._tags = tuple(self._tags)
 
     # --- Properties ---
+    # Collections are stored as tuples and replaced on mutation, so reads
+    # hand out the stored value itself: immutable and allocation-free.
 
     @property
-    def phones(self) -> List[Phone]:
-        """Returns a copy of the phones list."""
-        return self._phones[:]
+    def phones(self) -> Tuple[Phone, ...]:
+        """Returns a read-only view of the phones."""
+        return self._phones
 
     @property
-    def notes(self) -> List[str]:
-        """Returns a copy of the notes list."""
-        return self._notes[:]
+    def notes(self) -> Tuple[str, ...]:
+        """Returns a read-only view of the notes."""
+        return self._notes
 
     @property
-    def tags(self) -> List[str]:
-        """Returns a copy of the tags list."""
-        return self._tags[:]
+    def tags(self) -> Tuple[str, ...]:
+        """Returns a read-only view of the tags."""
+        return self._tags
 
     # --- Phone Management ---
 
     def add_phone(self, phone: str) -> None:
         """Adds a phone number after validation."""
-        self._phones.append(Phone(phone))
+        new_phone = Phone(phone)
+        self._phones += (new_phone,)
+        if self._book is not None:
+            self._book._index_phone(new_phone.number, self.name.value)
+        self._touch()
 
     def remove_phone(self, phone: str) -> None:
         """Removes a phone number by value."""
-        norm_phone = normalize_phone(phone)
-        self._phones = [p for p in self._phones if p.value != norm_phone]
+        number = pack_phone(phone)
+        self._phones = tuple(p for p in self._phones if p.number != number)
+        if self._book is not None and number is not None:
+            self._book._unindex_phone(number, self.name.value)
+        self._touch()
 
     def edit_phone(self, old_phone: str, new_phone: str) -> None:
         """Edits an existing phone number."""
-        norm_old = normalize_phone(old_phone)
+        old_number = pack_phone(old_phone)
         for i, phone in enumerate(self._phones):
-            if phone.value == norm_old:
-                self._phones[i] = Phone(new_phone)
+            if phone.number == old_number:
+                replacement = Phone(new_phone)
+                self._phones = self._phones[:i] + (replacement,) + self._phones[i + 1:]
+                if self._book is not None:
+                    if all(p.number != old_number for p in self._phones):
+                        self._book._unindex_phone(old_number, self.name.value)
+                    self._book._index_phone(replacement.number, self.name.value)
+                self._touch()
                 return
         raise ValueError(f"Phone {old_phone} not found")
 
     def find_phone(self, phone: str) -> Optional[Phone]:
         """Finds a phone object by value."""
-        norm_phone = normalize_phone(phone)
+        number = pack_phone(phone)
+        if number is None:
+            return None
         for p in self._phones:
-            if p.value == norm_phone:
+            if p.number == number:
                 return p
         return None
 
     # --- Email & Birthday Management ---
 
     def add_email(self, email: str) -> None:
-        self.email = Email(email)
+        new_email = Email(email)
+        if self._book is not None:
+            if self.email:
+                self._book._unindex_email(self.email.value, self.name.value)
+            self._book._index_email(new_email.value, self.name.value)
+        self.email = new_email
+        self._touch()
 
     def add_birthday(self, birthday: str) -> None:
-        self.birthday = Birthday(birthday)
+        new_birthday = Birthday(birthday)
+        if self._book is not None:
+            if self.birthday:
+                self._book._unindex_birthday(self.birthday.date_obj, self.name.value)
+            self._book._index_birthday(new_birthday.date_obj, self.name.value)
+        self.birthday = new_birthday
+        self._touch()
 
     def days_to_birthday(self, today: Optional[date] = None) -> Optional[int]:
         """Calculates days until the next birthday."""
@@ -122,29 +303,26 @@ class Record:
         if today is None:
             today = date.today()
 
-        bdate = self.birthday.date_obj
-        this_year_bday = date(today.year, bdate.month, bdate.day)
-        
-        if this_year_bday < today:
-            this_year_bday = date(today.year + 1, bdate.month, bdate.day)
-            
-        return (this_year_bday - today).days
+        return (next_birthday(self.birthday.date_obj, today) - today).days
 
     # --- Notes Management ---
 
     def add_note(self, note: str) -> None:
         if note:
-             self._notes.append(note)
+             self._notes += (note,)
+             self._touch()
 
     def edit_note(self, index: int, new_note: str) -> None:
         if 0 <= index < len(self._notes):
-            self._notes[index] = new_note
+            self._notes = self._notes[:index] + (new_note,) + self._notes[index + 1:]
+            self._touch()
         else:
             raise IndexError("Note index out of range")
 
     def remove_note(self, index: int) -> None:
         if 0 <= index < len(self._notes):
-            self._notes.pop(index)
+            self._notes = self._notes[:index] + self._notes[index + 1:]
+            self._touch()
         else:
             raise IndexError("Note index out of range")
 
@@ -153,12 +331,18 @@ class Record:
     def add_tag(self, tag: str) -> None:
         tag = self._normalize_tag(tag)
         if tag and tag not in self._tags:
-            self._tags.append(tag)
+            self._tags += (tag,)
+            if self._book is not None:
+                self._book._index_tag(tag, self.name.value)
+            self._touch()
 
     def remove_tag(self, tag: str) -> None:
         tag = self._normalize_tag(tag)
         if tag in self._tags:
-            self._tags.remove(tag)
+            self._tags = tuple(t for t in self._tags if t != tag)
+            if self._book is not None:
+                self._book._unindex_tag(tag, self.name.value)
+            self._touch()
 
     def has_tag(self, tag: str) -> bool:
         """Checks if the record has a specific tag (case-insensitive)."""
@@ -168,80 +352,371 @@ class Record:
     def _normalize_tag(tag: str) -> str:
         return tag.strip().casefold()
 
+    def _touch(self) -> None:
+        """Reports a mutation to the owning book so it can be persisted."""
+        if self._book is not None:
+            self._book._record_mutated(self)
+
     def __str__(self) -> str:
         phones_str = '; '.join(p.value for p in self._phones)
         return f"Contact name: {self.name.value}, phones: {phones_str}"
 
 
+# Owners of an indexed phone/email: one name, or several in insertion order
+Owners = Union[str, Dict[str, None]]
+
+
+def _add_owner(index: Dict[Any, Owners], key: Any, owner: str) -> None:
+    current = index.get(key)
+    if current is None:
+        index[key] = owner
+    elif isinstance(current, str):
+        if current != owner:
+            index[key] = {current: None, owner: None}
+    else:
+        current[owner] = None
+
+
+def _remove_owner(index: Dict[Any, Owners], key: Any, owner: str) -> None:
+    current = index.get(key)
+    if current == owner:
+        del index[key]
+    elif isinstance(current, dict):
+        current.pop(owner, None)
+        if len(current) == 1:
+            index[key] = next(iter(current))
+
+
+def _first_owner(owners: Optional[Owners]) -> Optional[str]:
+    """The earliest remaining owner, as the scan these indexes replace returned."""
+    if owners is None or isinstance(owners, str):
+        return owners
+    return next(iter(owners))
+
+
 class AddressBook(UserDict):
-    """Class for storing and managing records."""
-    
+    """
+    Class for storing and managing records.
+    Maintains phone -> owner and email -> owner indexes for O(1) uniqueness checks,
+    a tag -> names inverted index for tag queries, a birthday calendar index
+    and a lazily refreshed full-text SearchIndex.
+    Books restored from disk defer building the indexes until first queried.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        # Value -> owner name. Imports do not enforce uniqueness, so a value held by
+        # several contacts maps to an insertion-ordered dict of their names instead.
+        self._phone_owners: Dict[int, Owners] = {}
+        self._email_owners: Dict[str, Owners] = {}
+        # Values are dicts used as insertion-ordered sets of contact names.
+        self._tag_members: Dict[str, Dict[str, None]] = {}
+        # (month, day) -> names born that day, scanned in calendar order for birthday windows.
+        self._birthdays: Dict[Tuple[int, int], Dict[str, None]] = {}
+        # Names added, modified or deleted since the last pop_changes() call.
+        self._changed: Dict[str, None] = {}
+        # Bumped by every mutation; compared with saved_generation to skip redundant saves.
+        self.generation = 0
+        self.saved_generation = 0
+        # False while the indexes above are deferred (see _ensure_indexes).
+        self._indexed = True
+        self._search = SearchIndex({})
+        super().__init__(*args, **kwargs)
+        self._search.reset(self.data)
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        previous = self.data.get(name)
+        if previous is not None and previous is not record:
+            self._unlink(previous)
+        self.data[name] = record
+        self._link(record)
+        self._mark_changed(name)
+
+    def __delitem__(self, name: str) -> None:
+        record = self.data.pop(name)
+        self._unlink(record)
+        self._mark_changed(name)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Indexes are derived data; they are rebuilt on unpickling.
+        return {"data": self.data}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.data = state.get("data", {})
+        self._changed = {}
+        self.generation = 0
+        self.saved_generation = 0
+        self._rebuild_indexes()
+
     def add_record(self, record: Record) -> None:
-        self.data[record.name.value] = record
+        self[record.name.value] = record
+
+    def load_records(self, records: Iterable[Record]) -> None:
+        """
+        Bulk-adds records restored from our own storage.
+        Indexes are rebuilt lazily on first use and the records are not reported
+        as changes (the caller decides whether the book is saved).
+        """
+        for record in records:
+            self.data[record.name.value] = record
+        self.generation += 1
+        self._rebuild_indexes()
 
     def find(self, name: str) -> Optional[Record]:
         return self.data.get(name)
 
     def delete(self, name: str) -> bool:
         if name in self.data:
-            del self.data[name]
+            del self[name]
             return True
         return False
 
+    def clear(self) -> None:
+        """Removes all records and resets the indexes."""
+        for name in self.data:
+            self._mark_changed(name)
+        self._detach_all()
+        self.data.clear()
+        self._phone_owners.clear()
+        self._email_owners.clear()
+        self._tag_members.clear()
+        self._birthdays.clear()
+        self._indexed = True
+        self._search.reset(self.data)
+
     def get_upcoming_birthdays(self, days: int = 7) -> List[Dict[str, Any]]:
         """
         Finds contacts with birthdays in the upcoming 'days'.
-        Returns a list of dicts: {'name': str, 'birthday': str, 'days_until': int}
+        Returns a list of dicts: {'name': str, 'birthday': str, 'days_until': int},
+        ordered by 'days_until'.
         """
         upcoming = []
         today = date.today()
-        
-        for record in self.data.values():
-            if not record.birthday:
-                continue
-
-            days_until = record.days_to_birthday(today)
-            
-            if days_until is not None and 0 <= days_until <= days:
-                upcoming.append({
-                    "name": record.name.value,
-                    "birthday": record.birthday.value,
-                    "days_until": days_until
-                })
-                
-        return sorted(upcoming, key=lambda x: x['days_until'])
+
+        for days_until, name in self._scan_birthdays(today, days):
+            upcoming.append({
+                "name": name,
+                "birthday": self._birthday_value(name),
+                "days_until": days_until
+            })
+
+        return upcoming
+
+    def _scan_birthdays(self, today: date, days: int) -> Iterator[Tuple[int, str]]:
+        """
+        Yields (days_until, name) for birthdays within 'days' of 'today',
+        walking the calendar forward so rows come out already ordered.
+        """
+        self._ensure_indexes()
+        stats.count('index.birthday')
+        for key, offset in birthday_window(today, days):
+            for name in self._birthdays.get(key, ()):
+                yield offset, name
+
+    def search(self, query: str, ranked: bool = False) -> List[str]:
+        """
+        Returns names of contacts whose name, phone or email contains 'query'
+        (case-insensitive). With 'ranked', name matches come first.
+        """
+        return self._search.search_contacts(query, ranked)
+
+    def search_notes(self, query: str) -> List[Tuple[str, int]]:
+        """Returns (name, note index) pairs for notes containing 'query' (case-insensitive)."""
+        return self._search.search_notes(query)
 
     def find_by_tag(self, tag: str) -> List[str]:
         """Returns a list of contact names that have the specified tag."""
-        return [record.name.value for record in self.data.values() if record.has_tag(tag)]
+        self._ensure_indexes()
+        stats.count('index.tag')
+        return list(self._tag_members.get(Record._normalize_tag(tag), ()))
         
-    def get_all_tags(self) -> Dict[str, List[str]]:
+    def get_all_tags(self) -> Dict[str, Sequence[str]]:
         """Returns the entire tags dictionary {name: [tags]}."""
-        return {name: r.tags for name, r in self.data.items() if r.tags}
+        self._ensure_indexes()
+        stats.count('index.tag')
+        tagged: Dict[str, Sequence[str]] = {}
+        for members in self._tag_members.values():
+            for name in members:
+                if name not in tagged:
+                    tagged[name] = self.data[name].tags
+        return tagged
 
     def get_unique_tags(self) -> Set[str]:
         """Returns a set of unique tags across all contacts."""
-        unique_tags = set()
-        for record in self.data.values():
-            unique_tags.update(record.tags)
-        return unique_tags
+        self._ensure_indexes()
+        return set(self._tag_members)
 
     # --- Global Uniqueness Helpers ---
 
     def find_phone_global(self, phone: str) -> Optional[str]:
         """Finds a contact name that owns the given phone number."""
-        norm = normalize_phone(phone)
-        for record in self.data.values():
-            for p in record.phones:
-                if p.value == norm:
-                    return record.name.value
-        return None
+        self._ensure_indexes()
+        stats.count('index.phone')
+        number = pack_phone(phone)
+        return _first_owner(self._phone_owners.get(number)) if number is not None else None
 
     def find_email_global(self, email: str) -> Optional[str]:
         """Finds a contact name that owns the given email."""
+        self._ensure_indexes()
+        stats.count('index.email')
+        return _first_owner(self._email_owners.get(email))
+
+    # --- Bulk Access ---
+
+    def iter_rows(self) -> Iterator[Tuple[str, List[str], Optional[str], Optional[str], Sequence[str], Sequence[str]]]:
+        """
+        Yields (name, phones, email, birthday, notes, tags) as plain values.
+        Used by serializers so bulk exports do not depend on the storage backend.
+        """
+        stats.count('scan.iter_rows')
+        for name, record in self.data.items():
+            yield (
+                name,
+                [p.value for p in record.phones],
+                record.email.value if record.email else None,
+                record.birthday.value if record.birthday else None,
+                record.notes,
+                record.tags
+            )
+
+    def _birthday_value(self, name: str) -> str:
+        return self.data[name].birthday.value
+
+    def _attach(self, record: Record) -> None:
+        """Points a record's mutation hooks at this book without re-indexing it."""
+        record._book = self
+
+    def _attach_all(self) -> None:
+        """Points every stored record's mutation hooks at this book (used after unpickling)."""
         for record in self.data.values():
-            if record.email and record.email.value == email:
-                return record.name.value
-        return None
+            record._book = self
+
+    def _detach_all(self) -> None:
+        """Unlinks every record object from this book (used by clear)."""
+        for record in self.data.values():
+            record._book = None
 
+    # --- Change Tracking ---
 
+    @property
+    def dirty(self) -> bool:
+        """True if the book changed since the last mark_saved() call."""
+        return self.generation != self.saved_generation
+
+    def mark_saved(self, generation: Optional[int] = None) -> None:
+        """
+        Records that the current state is persisted, or only the state as of
+        'generation' if it was captured before a save that ran unlocked.
+        """
+        self.saved_generation = self.generation if generation is None else generation
+
+    def mark_dirty(self) -> None:
+        """Forces the next save even though nothing was mutated (e.g. stale files on disk)."""
+        self.saved_generation = -1
+
+    def pop_changes(self) -> List[str]:
+        """Returns names changed since the previous call and resets the change set."""
+        changed = list(self._changed)
+        self._changed.clear()
+        return changed
+
+    def restore_changes(self, names: Iterable[str]) -> None:
+        """Puts back names taken by pop_changes() whose write failed, so they are written again."""
+        for name in names:
+            self._changed[name] = None
+
+    def _record_mutated(self, record: Record) -> None:
+        """Called by Record mutators after the record changed in place."""
+        self._mark_changed(record.name.value)
+
+    def _mark_changed(self, name: str) -> None:
+        self._changed[name] = None
+        self.generation += 1
+        self._search.invalidate(name)
+
+    # --- Index Maintenance (called by Record mutators) ---
+
+    def _link(self, record: Record) -> None:
+        """Attaches a record to this book and indexes its phones and email."""
+        record._book = self
+        name = record.name.value
+        for phone in record._phones:
+            self._index_phone(phone.number, name)
+        if record.email:
+            self._index_email(record.email.value, name)
+        for tag in record._tags:
+            self._index_tag(tag, name)
+        if record.birthday:
+            self._index_birthday(record.birthday.date_obj, name)
+
+    def _unlink(self, record: Record) -> None:
+        """Detaches a record from this book and drops its index entries."""
+        name = record.name.value
+        for phone in record._phones:
+            self._unindex_phone(phone.number, name)
+        if record.email:
+            self._unindex_email(record.email.value, name)
+        for tag in record._tags:
+            self._unindex_tag(tag, name)
+        if record.birthday:
+            self._unindex_birthday(record.birthday.date_obj, name)
+        record._book = None
+
+    def _rebuild_indexes(self) -> None:
+        """Re-attaches the records and defers the indexes until they are first needed."""
+        # Mutation hooks still write to the deferred indexes; _ensure_indexes replaces them.
+        self._phone_owners = {}
+        self._email_owners = {}
+        self._tag_members = {}
+        self._birthdays = {}
+        self._indexed = False
+        self._search = SearchIndex(self.data)
+        self._attach_all()
+
+    def _ensure_indexes(self) -> None:
+        """Builds the phone, email, tag and birthday indexes if they were deferred."""
+        if self._indexed:
+            return
+        # Hook calls made while deferred are discarded; the scan covers them.
+        self._phone_owners = {}
+        self._email_owners = {}
+        self._tag_members = {}
+        self._birthdays = {}
+        self._indexed = True
+        stats.count('scan.index_build')
+        for record in self.data.values():
+            self._link(record)
+
+    def _index_phone(self, phone: int, owner: str) -> None:
+        _add_owner(self._phone_owners, phone, owner)
+
+    def _unindex_phone(self, phone: int, owner: str) -> None:
+        _remove_owner(self._phone_owners, phone, owner)
+
+    def _index_email(self, email: str, owner: str) -> None:
+        _add_owner(self._email_owners, email, owner)
+
+    def _unindex_email(self, email: str, owner: str) -> None:
+        _remove_owner(self._email_owners, email, owner)
+
+    def _index_tag(self, tag: str, name: str) -> None:
+        self._tag_members.setdefault(tag, {})[name] = None
+
+    def _unindex_tag(self, tag: str, name: str) -> None:
+        members = self._tag_members.get(tag)
+        if members is None:
+            return
+        members.pop(name, None)
+        if not members:
+            del self._tag_members[tag]
+
+    def _index_birthday(self, born: date, name: str) -> None:
+        self._birthdays.setdefault((born.month, born.day), {})[name] = None
+
+    def _unindex_birthday(self, born: date, name: str) -> None:
+        key = (born.month, born.day)
+        members = self._birthdays.get(key)
+        if members is None:
+            return
+        members.pop(name, None)
+        if not members:
+            del self._birthdays[key]
@@ -0,0 +1,184 @@
+from typing import Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+from assistant_bot.utils import stats
+
+__all__ = ["SearchIndex"]
+
+# Length of the substrings indexed for candidate lookup.
+NGRAM_SIZE = 3
+
+# Ranking buckets for contact search results (lower is better).
+RANK_EXACT_NAME = 0
+RANK_NAME_PREFIX = 1
+RANK_NAME_MATCH = 2
+RANK_FIELD_MATCH = 3
+
+
+def _ngrams(text: str) -> Set[str]:
+    """Returns the distinct n-grams of a (lowercased) string."""
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """
+    Trigram index over contact names, phones, emails and notes.
+
+    Candidates come from intersecting the posting sets of the query's trigrams
+    and are then verified with the same substring rules the commands always used:
+    case-insensitive for names, emails and notes, verbatim for phones.
+    Queries shorter than a trigram fall back to scanning the pre-lowered texts.
+
+    The index is refreshed lazily: changed names are queued by the owning
+    AddressBook and re-indexed on the next query.
+    """
+
+    def __init__(self, records: Mapping[str, Any]):
+        self.reset(records)
+
+    # --- Maintenance ---
+
+    def reset(self, records: Mapping[str, Any]) -> None:
+        """Drops the index; it is rebuilt in full from 'records' on the next query."""
+        self._records = records
+        self._contact_grams: Dict[str, Set[str]] = {}
+        self._note_grams: Dict[str, Set[str]] = {}
+        # name -> (lowered name, phones..., lowered email)
+        self._contact_texts: Dict[str, Tuple[str, ...]] = {}
+        # name -> lowered notes
+        self._note_texts: Dict[str, Tuple[str, ...]] = {}
+        # name -> insertion sequence, so results keep address book order.
+        self._order: Dict[str, int] = {}
+        self._next_seq = 0
+        self._pending: Dict[str, None] = {}
+        self._full_build = True
+
+    def invalidate(self, name: str) -> None:
+        """Queues a contact for re-indexing on the next query."""
+        if not self._full_build:
+            self._pending[name] = None
+
+    def _refresh(self) -> None:
+        if self._full_build:
+            self._full_build = False
+            self._pending.clear()
+            stats.count('scan.search_index_build')
+            for name, record in self._records.items():
+                self._add(name, record)
+            return
+
+        pending = list(self._pending)
+        self._pending.clear()
+        for name in pending:
+            self._remove(name)
+            record = self._records.get(name)
+            if record is not None:
+                self._add(name, record)
+
+    def _add(self, name: str, record: Any) -> None:
+        contact_texts = [name.lower()]
+        contact_texts.extend(p.value for p in record.phones)
+        if record.email:
+            contact_texts.append(record.email.value.lower())
+        note_texts = tuple(note.lower() for note in record.notes)
+
+        self._contact_texts[name] = tuple(contact_texts)
+        if note_texts:
+            self._note_texts[name] = note_texts
+        if name not in self._order:
+            self._order[name] = self._next_seq
+            self._next_seq += 1
+
+        for gram in set().union(*map(_ngrams, contact_texts)):
+            self._contact_grams.setdefault(gram, set()).add(name)
+        for gram in set().union(*map(_ngrams, note_texts)):
+            self._note_grams.setdefault(gram, set()).add(name)
+
+    def _remove(self, name: str) -> None:
+        contact_texts = self._contact_texts.pop(name, ())
+        note_texts = self._note_texts.pop(name, ())
+        if name not in self._records:
+            self._order.pop(name, None)
+
+        self._discard(self._contact_grams, contact_texts, name)
+        self._discard(self._note_grams, note_texts, name)
+
+    @staticmethod
+    def _discard(postings: Dict[str, Set[str]], texts: Iterable[str], name: str) -> None:
+        for gram in set().union(*map(_ngrams, texts)):
+            members = postings.get(gram)
+            if members is None:
+                continue
+            members.discard(name)
+            if not members:
+                del postings[gram]
+
+    # --- Queries ---
+
+    def search_contacts(self, query: str, ranked: bool = False) -> List[str]:
+        """
+        Returns names whose name, phone or email contains 'query'.
+        Results keep address book order, or best matches first when 'ranked'.
+        """
+        self._refresh()
+        query = query.lower()
+        candidates = self._candidates(self._contact_grams, self._contact_texts, query)
+
+        matches = [
+            name for name in candidates
+            if any(query in text for text in self._contact_texts[name])
+        ]
+
+        if ranked:
+            matches.sort(key=lambda name: (self._rank(name, query), self._order[name]))
+        else:
+            matches.sort(key=self._order.__getitem__)
+        return matches
+
+    def search_notes(self, query: str) -> List[Tuple[str, int]]:
+        """Returns (name, note index) pairs for every note containing 'query'."""
+        self._refresh()
+        query = query.lower()
+        candidates = sorted(
+            self._candidates(self._note_grams, self._note_texts, query),
+            key=self._order.__getitem__
+        )
+
+        return [
+            (name, i)
+            for name in candidates
+            for i, note in enumerate(self._note_texts[name])
+            if query in note
+        ]
+
+    @staticmethod
+    def _candidates(
+        postings: Dict[str, Set[str]],
+        texts: Dict[str, Tuple[str, ...]],
+        query: str
+    ) -> Iterable[str]:
+        """Narrows the search to names sharing every trigram of the query."""
+        if len(query) < NGRAM_SIZE:
+            # Too short for the index: every contact is a candidate
+            stats.count('scan.search')
+            return texts.keys()
+        stats.count('index.search')
+
+        sets = []
+        for gram in _ngrams(query):
+            members = postings.get(gram)
+            if not members:
+                return ()
+            sets.append(members)
+
+        sets.sort(key=len)
+        return sets[0].intersection(*sets[1:])
+
+    def _rank(self, name: str, query: str) -> int:
+        lowered = self._contact_texts[name][0]
+        if lowered == query:
+            return RANK_EXACT_NAME
+        if lowered.startswith(query):
+            return RANK_NAME_PREFIX
+        if query in lowered:
+            return RANK_NAME_MATCH
+        return RANK_FIELD_MATCH
@@ -0,0 +1,437 @@
+import os
+import mmap
+import itertools
+import struct
+from collections.abc import MutableMapping
+from datetime import date
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+from weakref import WeakValueDictionary
+
+from assistant_bot.config import SNAPSHOT_STORAGE_PATH
+from assistant_bot.models import AddressBook, Record
+from assistant_bot.utils.atomic import atomic_write
+from assistant_bot.utils import stats
+from assistant_bot.utils.validators import format_birthday, format_phone
+
+__all__ = [
+    "SNAPSHOT_VERSION",
+    "SnapshotReader",
+    "SnapshotStore",
+    "SnapshotAddressBook",
+    "write_snapshot",
+    "encode_rows",
+    "write_snapshot_chunks",
+    "open_snapshot",
+]
+
+# --- File Layout ---
+#
+# header   magic, version, flags, record count, name index offset
+# records  one block per contact, in address book order:
+#            u32 block length (excluding itself)
+#            u32 name length, name
+#            i32 birthday ordinal (0 = none)
+#            u16 phone count, u64 per phone (packed, see Phone.number)
+#            u32 email length, email (0 = none)
+#            u16 note count, (u32 length, note) per note
+#            u16 tag count, (u32 length, tag) per tag
+# index    u64 record offset per contact, sorted by UTF-8 name
+#
+# All integers are little-endian; strings are UTF-8.
+
+SNAPSHOT_MAGIC = b'ABOOKSNP'
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct('<8sHHIQ')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_I32 = struct.Struct('<i')
+_U64 = struct.Struct('<Q')
+
+# (name, phones, email, birthday ordinal or 0, notes, tags)
+# Phones are packed numbers (see Phone.number).
+SnapshotRow = Tuple[str, Tuple[int, ...], Optional[str], int, Tuple[str, ...], Tuple[str, ...]]
+# Consecutive encoded blocks, plus (UTF-8 name, block offset within them) per row
+EncodedChunk = Tuple[bytes, List[Tuple[bytes, int]]]
+
+SNAPSHOT_WRITE_BATCH_SIZE = 1000  # rows encoded per chunk by write_snapshot
+
+
+def _birthday_ordinal(value: Optional[str]) -> int:
+    """Converts a stored 'DD-MM-YYYY' birthday to an ordinal (0 when unset)."""
+    if not value:
+        return 0
+    return date(int(value[6:]), int(value[3:5]), int(value[:2])).toordinal()
+
+
+def _encode_block(name: str, phones: Sequence[int], email: Optional[str],
+                  ordinal: int, notes: Sequence[str], tags: Sequence[str]) -> bytes:
+    parts: List[bytes] = []
+
+    encoded = name.encode('utf-8')
+    parts += (_U32.pack(len(encoded)), encoded, _I32.pack(ordinal), _U16.pack(len(phones)))
+    parts += (_U64.pack(phone) for phone in phones)
+
+    encoded = email.encode('utf-8') if email else b''
+    parts += (_U32.pack(len(encoded)), encoded)
+
+    for items in (notes, tags):
+        parts.append(_U16.pack(len(items)))
+        for item in items:
+            encoded = item.encode('utf-8')
+            parts += (_U32.pack(len(encoded)), encoded)
+
+    payload = b''.join(parts)
+    return _U32.pack(len(payload)) + payload
+
+
+def write_snapshot(book: AddressBook, path: str = SNAPSHOT_STORAGE_PATH) -> None:
+    """
+    Writes the book as a binary snapshot.
+    The file is written atomically, so a reader that still maps the previous
+    snapshot keeps a consistent view.
+    """
+    rows = (
+        (name, tuple(int(phone[1:]) for phone in phones), email, _birthday_ordinal(birthday), notes, tags)
+        for name, phones, email, birthday, notes, tags in book.iter_rows()
+    )
+    batches = iter(lambda: list(itertools.islice(rows, SNAPSHOT_WRITE_BATCH_SIZE)), [])
+    write_snapshot_chunks((encode_rows(batch) for batch in batches), path)
+
+
+def encode_rows(rows: Iterable[SnapshotRow]) -> EncodedChunk:
+    """Encodes rows into consecutive record blocks (can run in a worker process)."""
+    blocks: List[bytes] = []
+    names: List[Tuple[bytes, int]] = []
+    offset = 0
+    for name, numbers, email, ordinal, notes, tags in rows:
+        block = _encode_block(name, numbers, email, ordinal, notes, tags)
+        names.append((name.encode('utf-8'), offset))
+        blocks.append(block)
+        offset += len(block)
+    return b''.join(blocks), names
+
+
+def write_snapshot_chunks(chunks: Iterable[EncodedChunk], path: str = SNAPSHOT_STORAGE_PATH) -> None:
+    """
+    Writes a snapshot from a stream of encoded chunks (names must be unique).
+    Only the name index is kept in memory, so callers can produce contacts
+    without building an AddressBook (e.g. generate_data's streaming mode).
+    """
+    index: List[Tuple[bytes, int]] = []
+    with atomic_write(path, 'wb') as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, 0, 0))
+        offset = _HEADER.size
+
+        for blocks, names in chunks:
+            index += ((name, offset + block_offset) for name, block_offset in names)
+            f.write(blocks)
+            offset += len(blocks)
+
+        index.sort()
+        f.write(b''.join(_U64.pack(block_offset) for _, block_offset in index))
+        f.seek(0)
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, 0, len(index), offset))
+
+
+class SnapshotReader:
+    """
+    Read-only view of a snapshot file through mmap.
+    Opening reads only the header and the first and last index entries, so
+    it costs the same for any book size; lookups binary-search the index and
+    decode just the blocks they land on. Other offsets are bounds-checked as
+    they are read and raise ValueError if the file is damaged.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, _, count, index_offset = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError('Snapshot is truncated')
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            self._mm.close()
+            raise ValueError(f'Unsupported snapshot format (version {version})')
+        # Reject a truncated file now, while load_all can still fall back to
+        # another format: the index must end the file exactly.
+        if index_offset < _HEADER.size or index_offset + count * _U64.size != len(self._mm):
+            self._mm.close()
+            raise ValueError('Snapshot is truncated')
+
+        self.count = count
+        self._index_offset = index_offset
+        if count:
+            try:
+                self._name_bytes(self._offset_at(0))
+                self._name_bytes(self._offset_at(count - 1))
+            except ValueError:
+                self._mm.close()
+                raise
+
+    def close(self) -> None:
+        self._mm.close()
+
+    # --- Lookup ---
+
+    def find(self, name: str) -> Optional[int]:
+        """Returns the block offset of 'name', or None."""
+        key = name.encode('utf-8')
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = self._offset_at(mid)
+            probe = self._name_bytes(offset)
+            if probe == key:
+                return offset
+            if probe < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def iter_names(self) -> Iterator[str]:
+        """Yields names in address book order, skipping over the rest of each block."""
+        mm = self._mm
+        offset = _HEADER.size
+        while offset < self._index_offset:
+            yield self._name_bytes(offset).decode('utf-8')
+            offset += _U32.size + _U32.unpack_from(mm, offset)[0]
+
+    def iter_rows(self) -> Iterator[SnapshotRow]:
+        """Yields every row in address book order."""
+        mm = self._mm
+        offset = _HEADER.size
+        while offset < self._index_offset:
+            yield self.decode(offset)
+            offset += _U32.size + _U32.unpack_from(mm, offset)[0]
+
+    def _offset_at(self, position: int) -> int:
+        """Returns the block offset stored at 'position' of the name index."""
+        offset = _U64.unpack_from(self._mm, self._index_offset + position * _U64.size)[0]
+        if not _HEADER.size <= offset <= self._index_offset - 2 * _U32.size:
+            raise ValueError('Snapshot index is damaged')
+        return offset
+
+    # --- Decoding ---
+
+    def _name_bytes(self, offset: int) -> bytes:
+        start = offset + 2 * _U32.size
+        end = start + _U32.unpack_from(self._mm, offset + _U32.size)[0]
+        if end > self._index_offset:
+            raise ValueError('Snapshot record is damaged')
+        return self._mm[start:end]
+
+    def decode(self, offset: int) -> SnapshotRow:
+        """Decodes the block at 'offset'."""
+        mm = self._mm
+        if offset + _U32.size + _U32.unpack_from(mm, offset)[0] > self._index_offset:
+            raise ValueError('Snapshot record is damaged')
+        pos = offset + _U32.size
+
+        def text() -> str:
+            nonlocal pos
+            length = _U32.unpack_from(mm, pos)[0]
+            pos += _U32.size + length
+            return mm[pos - length:pos].decode('utf-8')
+
+        def texts() -> Tuple[str, ...]:
+            nonlocal pos
+            count = _U16.unpack_from(mm, pos)[0]
+            pos += _U16.size
+            return tuple(text() for _ in range(count))
+
+        name = text()
+        ordinal = _I32.unpack_from(mm, pos)[0]
+        phone_count = _U16.unpack_from(mm, pos + _I32.size)[0]
+        pos += _I32.size + _U16.size
+        phones = struct.unpack_from(f'<{phone_count}Q', mm, pos)
+        pos += phone_count * _U64.size
+        email = text() or None
+        notes = texts()
+        tags = texts()
+        return name, phones, email, ordinal, notes, tags
+
+
+class SnapshotStore(MutableMapping):
+    """
+    Mapping of contacts backed by a mapped snapshot plus an in-memory overlay.
+
+    Snapshot records are decoded on access and kept only while referenced
+    elsewhere, so lookups of a contact in use return the same object. As in
+    ColumnStore, they are attached to the owning book, whose mutation hook
+    moves an edited record into the overlay. New and replaced records live in
+    the overlay, deleted snapshot names are remembered, and iteration keeps
+    dict order: surviving snapshot names first, then names added since it was
+    written.
+    """
+
+    def __init__(self, reader: Optional[SnapshotReader] = None, owner: Optional[AddressBook] = None) -> None:
+        self.reader = reader
+        self.owner = owner
+        self._overlay: Dict[str, Record] = {}
+        # Snapshot names that were deleted (they may be re-added to _extra).
+        self._removed: Set[str] = set()
+        # Names stored past the end of the snapshot, in insertion order.
+        self._extra: Dict[str, None] = {}
+        # Decoded snapshot records still in use (weakly held).
+        self._live: 'WeakValueDictionary[str, Record]' = WeakValueDictionary()
+
+    def _in_snapshot(self, name: str) -> bool:
+        return self.reader is not None and name not in self._removed and self.reader.find(name) is not None
+
+    # --- Mapping Protocol ---
+
+    def __getitem__(self, name: str) -> Record:
+        record = self._overlay.get(name)
+        if record is not None:
+            return record
+        if name in self._removed or self.reader is None:
+            raise KeyError(name)
+        record = self._live.get(name)
+        if record is not None:
+            return record
+        offset = self.reader.find(name)
+        if offset is None:
+            raise KeyError(name)
+        record = self._live[name] = self._materialize(self.reader.decode(offset))
+        return record
+
+    def __setitem__(self, name: str, record: Record) -> None:
+        if name not in self._extra and not self._in_snapshot(name):
+            self._extra[name] = None
+        self._overlay[name] = record
+
+    def __delitem__(self, name: str) -> None:
+        if name in self._extra:
+            del self._extra[name]
+        elif self._in_snapshot(name):
+            self._removed.add(name)
+        else:
+            raise KeyError(name)
+        self._overlay.pop(name, None)
+        self._live.pop(name, None)
+
+    def __iter__(self) -> Iterator[str]:
+        if self.reader is not None:
+            for name in self.reader.iter_names():
+                if name not in self._removed:
+                    yield name
+        yield from self._extra
+
+    def __len__(self) -> int:
+        count = self.reader.count if self.reader is not None else 0
+        return count - len(self._removed) + len(self._extra)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and (name in self._extra or self._in_snapshot(name))
+
+    def clear(self) -> None:
+        self.reader = None
+        self._overlay.clear()
+        self._removed.clear()
+        self._extra.clear()
+        self._live.clear()
+
+    # --- Bulk Access (no materialization) ---
+
+    def iter_raw(self) -> Iterator[SnapshotRow]:
+        """Yields every row as plain values; overlay records replace their snapshot rows."""
+        if self.reader is not None:
+            for row in self.reader.iter_rows():
+                name = row[0]
+                if name in self._removed:
+                    continue
+                record = self._overlay.get(name)
+                yield row if record is None else _row_of(record)
+        for name in self._extra:
+            yield _row_of(self._overlay[name])
+
+    def overlay_records(self) -> Iterable[Record]:
+        return self._overlay.values()
+
+    def write_back(self, record: Record) -> None:
+        """Keeps an edited snapshot record in the overlay so the change is seen by later lookups."""
+        name = record.name.value
+        if name not in self._overlay and name in self:
+            self._overlay[name] = record
+
+    def _materialize(self, row: SnapshotRow) -> Record:
+        name, phones, email, ordinal, notes, tags = row
+        record = Record.from_trusted(
+            name,
+            phones=phones,
+            email=email,
+            birthday=date.fromordinal(ordinal) if ordinal else None,
+            notes=notes,
+            tags=tags
+        )
+        if self.owner is not None:
+            self.owner._attach(record)
+        return record
+
+
+def _row_of(record: Record) -> SnapshotRow:
+    return (
+        record.name.value,
+        tuple(p.number for p in record.phones),
+        record.email.value if record.email else None,
+        record.birthday.date_obj.toordinal() if record.birthday else 0,
+        record.notes,
+        record.tags
+    )
+
+
+class SnapshotAddressBook(AddressBook):
+    """
+    AddressBook opened lazily from a binary snapshot.
+    Opening costs the same for any book size: records are decoded (and their
+    offsets checked) as they are found, and the phone/email/tag/birthday
+    indexes are built on first use.
+    Pickles as a plain AddressBook.
+    """
+
+    def __init__(self, reader: Optional[SnapshotReader] = None):
+        super().__init__()
+        self.data = SnapshotStore(reader, self)
+        self._rebuild_indexes()
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The mapped file cannot be pickled; persist the records themselves.
+        return (AddressBook, (), {"data": dict(self.data.items())})
+
+    def iter_rows(self) -> Iterator[Tuple[str, List[str], Optional[str], Optional[str], Sequence[str], Sequence[str]]]:
+        stats.count('scan.iter_rows')
+        for name, phones, email, ordinal, notes, tags in self.data.iter_raw():
+            yield (
+                name,
+                [format_phone(p) for p in phones],
+                email,
+                format_birthday(date.fromordinal(ordinal)) if ordinal else None,
+                notes,
+                tags
+            )
+
+    def _attach_all(self) -> None:
+        for record in self.data.overlay_records():
+            record._book = self
+
+    def _detach_all(self) -> None:
+        for record in self.data.overlay_records():
+            record._book = None
+
+    def _record_mutated(self, record: Record) -> None:
+        self.data.write_back(record)
+        super()._record_mutated(record)
+
+
+def open_snapshot(path: str = SNAPSHOT_STORAGE_PATH) -> Optional[SnapshotAddressBook]:
+    """
+    Opens a snapshot without decoding any records.
+    Returns None if the file is missing; raises ValueError if it is not a valid snapshot.
+    """
+    if not os.path.exists(path):
+        return None
+    return SnapshotAddressBook(SnapshotReader(path))
@@ -1,26 +1,193 @@
 import os
+import gc
 import json
-import pickle
-from typing import Optional, Dict, Any, List
+import hashlib
+import time
+import threading
+from datetime import date
+from contextlib import contextmanager
+from typing import Optional, Dict, Any, List, Iterator, Callable, Tuple
 
 from assistant_bot.config import (
     JSON_STORAGE_PATH,
     CSV_STORAGE_PATH,
     PICKLE_STORAGE_PATH,
-    DATA_DIR
+    SNAPSHOT_STORAGE_PATH,
+    MANIFEST_STORAGE_PATH,
+    DATA_DIR,
+    JOURNAL_COMPACT_THRESHOLD,
+    JOURNAL_COMPACT_INTERVAL,
+    PERSIST_DEBOUNCE_SECONDS,
+    ADDRESS_BOOK_BACKEND,
+    JSON_STORAGE_FORMAT
 )
 from assistant_bot.models import AddressBook, Record
+from assistant_bot.columnar import ColumnarAddressBook
+from assistant_bot.utils import stats
 from assistant_bot.utils.console import print_info
-from assistant_bot.import_export import export_file
+from assistant_bot.utils.atomic import atomic_write
+from assistant_bot import journal, snapshot
+
+# pickle, csv and import_export are imported where they are used: a clean
+# start opens the snapshot and rewrites nothing, so it never needs them.
 
 __all__ = [
+    "load_all",
     "load_address_book",
     "save_address_book",
     "load_pickle",
     "save_pickle",
-    "save_all"
+    "load_snapshot",
+    "save_snapshot",
+    "save_csv",
+    "save_all",
+    "save_changes",
+    "flush",
+    "deferred",
+    "PersistenceWorker",
+    "replay_journal",
+    "locked",
+    "new_address_book"
 ]
 
+# Version of the persisted layouts; bump it when record_to_dict or a file
+# format changes so files written by older code are revalidated and rewritten.
+STORAGE_FORMAT_VERSION = 1
+
+# Serializes book mutations (command handlers) against background compaction.
+_book_lock = threading.RLock()
+
+# Journal bookkeeping for compaction scheduling.
+_journal_entries = 0
+_last_compaction = time.monotonic()
+
+# One save_all at a time; waiting releases _book_lock (see save_all).
+_saving = False
+_save_done = threading.Condition(_book_lock)
+
+
+@contextmanager
+def locked() -> Iterator[None]:
+    """Holds the storage lock so the background writer never sees a half-applied change."""
+    with _book_lock:
+        yield
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """
+    Suspends the cyclic garbage collector during bulk loads: allocating
+    hundreds of thousands of records otherwise triggers repeated full scans.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def new_address_book() -> AddressBook:
+    """Creates an empty AddressBook using the configured in-memory backend."""
+    if ADDRESS_BOOK_BACKEND == 'columnar':
+        return ColumnarAddressBook()
+    return AddressBook()
+
+
+def record_to_dict(record: Record) -> Dict[str, Any]:
+    """Serializes a Record to the persisted dictionary layout."""
+    return {
+        "phones": [p.value for p in record.phones],
+        "email": record.email.value if record.email else None,
+        "birthday": record.birthday.value if record.birthday else None,
+        "notes": record.notes,
+        "tags": record.tags
+    }
+
+
+def record_from_trusted_dict(name: str, data: Dict[str, Any]) -> Record:
+    """
+    Builds a Record from the persisted dictionary layout without validation.
+    Only for data this module wrote itself (verified against the manifest).
+    """
+    birthday = data.get('birthday')
+    return Record.from_trusted(
+        name,
+        phones=data.get('phones') or (),
+        email=data.get('email'),
+        birthday=date(int(birthday[6:]), int(birthday[3:5]), int(birthday[:2])) if birthday else None,
+        notes=data.get('notes') or (),
+        tags=data.get('tags') or ()
+    )
+
+
+def record_from_dict(name: str, data: Dict[str, Any]) -> Record:
+    """
+    Builds a Record from the persisted dictionary layout.
+    Raises ValueError if any field fails validation.
+    """
+    record = Record(name)
+
+    # Phones
+    for p in data.get('phones', []):
+        record.add_phone(p)
+
+    # Email
+    email = data.get('email')
+    if email:
+        record.add_email(email)
+
+    # Birthday
+    bday = data.get('birthday')
+    if bday:
+        record.add_birthday(bday)
+
+    # Notes
+    notes = data.get('notes', [])
+    for n in notes:
+        record.add_note(n)
+
+    # Tags
+    tags = data.get('tags', [])
+    for t in tags:
+        record.add_tag(t)
+
+    return record
+
+
+@stats.timed('persist.load')
+def load_all() -> AddressBook:
+    """
+    Loads the book from the best intact copy on disk.
+    Snapshot, pickle and JSON are tried in that order, those matching the
+    manifest first; the CSV backup is the last resort. If files exist but
+    none can be read, they are moved aside (*.corrupt) so the next save
+    cannot overwrite them, and an empty book is returned.
+    """
+    os.makedirs(DATA_DIR, exist_ok=True)
+    manifest = _read_manifest()
+
+    loaders = [
+        ("snapshot", SNAPSHOT_STORAGE_PATH, load_snapshot),
+        ("pickle", PICKLE_STORAGE_PATH, load_pickle),
+        ("json", JSON_STORAGE_PATH, _load_json),
+    ]
+    loaders.sort(key=lambda loader: not _is_fresh(manifest, loader[0], loader[1]))
+    loaders.append(("csv", CSV_STORAGE_PATH, _load_csv))
+
+    for _, path, loader in loaders:
+        if not os.path.exists(path):
+            continue
+        book = loader()
+        if book is not None:
+            return book
+
+    _quarantine_unreadable()
+    book = new_address_book()
+    _mark_loaded(book, "json")
+    return book
+
 
 def load_address_book() -> AddressBook:
     """
@@ -28,84 +195,118 @@ def load_address_book() -> AddressBook:
     Handles migration from legacy dict-based format to OOP Record format.
     """
     os.makedirs(DATA_DIR, exist_ok=True)
-    book = AddressBook()
-    
+    book = _load_json()
+
+    if book is None:
+        book = new_address_book()
+        _mark_loaded(book, "json")
+    return book
+
+
+def _load_json() -> Optional[AddressBook]:
+    """Loads the JSON storage, or returns None if it is missing or unreadable."""
     if not os.path.exists(JSON_STORAGE_PATH):
-        return book
+        return None
 
-    try:
-        with open(JSON_STORAGE_PATH, 'r', encoding='utf-8') as f:
-            raw_data = json.load(f)
+    book = new_address_book()
+
+    with _gc_paused():
+        try:
+            with open(JSON_STORAGE_PATH, 'rb') as f:
+                content = f.read()
+            # Only content we wrote ourselves, in the current format, skips revalidation.
+            trusted = _is_trusted(_read_manifest(), "json", content)
+            raw_data = json.loads(content)
+        except (OSError, ValueError) as e:
+            print_info(f"Warning: Failed to load JSON data: {e}")
+            return None
 
-        if isinstance(raw_data, dict):
+        if not isinstance(raw_data, dict):
+            raw_data = {}
+
+        if trusted:
+            book.load_records(
+                record_from_trusted_dict(name, data) for name, data in raw_data.items()
+            )
+        else:
             for name, data in raw_data.items():
                 if not isinstance(data, dict):
                     continue
 
                 try:
-                    record = Record(name)
+                    book.add_record(record_from_dict(name, data))
+                except ValueError as e:
+                    print(f"Skipping invalid record '{name}': {e}")
 
-                    # Phones
-                    for p in data.get('phones', []):
-                        record.add_phone(p)
+    _mark_loaded(book, "json", trusted)
+    return book
 
-                    # Email
-                    email = data.get('email')
-                    if email:
-                        record.add_email(email)
 
-                    # Birthday
-                    bday = data.get('birthday')
-                    if bday:
-                        record.add_birthday(bday)
+def _load_csv() -> Optional[AddressBook]:
+    """Rebuilds the book from the CSV backup, or returns None if it is unreadable."""
+    import csv
+    from assistant_bot.import_export import import_file
 
-                    # Notes
-                    notes = data.get('notes', [])
-                    for n in notes:
-                        record.add_note(n)
+    book = new_address_book()
+    try:
+        with open(CSV_STORAGE_PATH, 'r', newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f), [])
+        if 'name' not in header:
+            raise ValueError('missing CSV header')
+        # Sequential: recovery must not depend on starting a process pool.
+        import_file(book, CSV_STORAGE_PATH, workers=1)
+    except (OSError, ValueError, csv.Error) as e:
+        print_info(f"Warning: Failed to load CSV backup: {e}")
+        return None
 
-                    # Tags
-                    tags = data.get('tags', [])
-                    for t in tags:
-                        record.add_tag(t)
+    print_info(f"Recovered {len(book)} contacts from the CSV backup.")
+    book.pop_changes()
+    _mark_loaded(book, "csv")
+    return book
 
-                    book.add_record(record)
-                except ValueError as e:
-                    print(f"Skipping invalid record '{name}': {e}")
 
-    except Exception as e:
-        print_info(f"Warning: Failed to load data or starting fresh: {e}")
-            
-    return book
+def _quarantine_unreadable() -> None:
+    """Renames existing data files to *.corrupt so they survive the next save."""
+    for _, path, _ in _FORMATS:
+        if os.path.exists(path):
+            try:
+                os.replace(path, path + '.corrupt')
+                print_info(f"Warning: {os.path.basename(path)} is unreadable; kept as {os.path.basename(path)}.corrupt")
+            except OSError as e:
+                print(f"Error moving unreadable {path}: {e}")
 
 
-def save_address_book(book: AddressBook, path: str = JSON_STORAGE_PATH) -> None:
+def save_address_book(book: AddressBook, path: str = JSON_STORAGE_PATH) -> bool:
     """
     Saves AddressBook to JSON storage.
-    Serializes Record objects to dictionaries.
+    Records are streamed out one by one in the JSON_STORAGE_FORMAT layout.
+    Returns True if the file was written.
     """
+    from assistant_bot.import_export import write_json_object
+
     if path != JSON_STORAGE_PATH:
         os.makedirs(os.path.dirname(path), exist_ok=True)
     else:
         os.makedirs(DATA_DIR, exist_ok=True)
-    
-    save_data = {}
-    
-    for name, record in book.data.items():
-        record_data = {
-            "phones": [p.value for p in record.phones],
-            "email": record.email.value if record.email else None,
-            "birthday": record.birthday.value if record.birthday else None,
-            "notes": record.notes,
-            "tags": record.tags
-        }
-        save_data[name] = record_data
-        
+
+    entries = (
+        (name, {
+            "phones": phones,
+            "email": email,
+            "birthday": birthday,
+            "notes": notes,
+            "tags": tags
+        })
+        for name, phones, email, birthday, notes, tags in book.iter_rows()
+    )
+
     try:
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(save_data, f, ensure_ascii=False, indent=2)
+        with atomic_write(path, 'w', encoding='utf-8') as f:
+            write_json_object(f, entries, compact=JSON_STORAGE_FORMAT == 'compact')
     except Exception as e:
         print(f"Error saving data: {e}")
+        return False
+    return True
 
 
 def load_pickle() -> Optional[AddressBook]:
@@ -116,43 +317,474 @@ def load_pickle() -> Optional[AddressBook]:
     if not os.path.exists(PICKLE_STORAGE_PATH):
         return None
 
+    import pickle
     try:
-        with open(PICKLE_STORAGE_PATH, 'rb') as f:
-            return pickle.load(f)
-    except (FileNotFoundError, EOFError, pickle.UnpicklingError) as e:
-        print(f"Warning: Failed to load pickle (starting fresh/legacy): {e}")
+        with open(PICKLE_STORAGE_PATH, 'rb') as f, _gc_paused():
+            book = pickle.load(f)
+    except Exception as e:
+        # A damaged pickle can fail in many ways (EOFError, UnpicklingError, ValueError...).
+        print(f"Warning: Failed to load pickle (falling back): {e}")
         return None
 
+    if not isinstance(book, AddressBook):
+        print("Warning: Pickle does not hold an AddressBook (falling back)")
+        return None
+
+    # Convert if the configured backend changed since the pickle was written.
+    converted = new_address_book()
+    if type(book) is not type(converted):
+        converted.update(book.data)
+        converted.pop_changes()
+        book = converted
 
-def save_pickle(book: AddressBook, path: str = PICKLE_STORAGE_PATH) -> None:
+    _mark_loaded(book, "pickle")
+    return book
+
+
+def save_pickle(book: AddressBook, path: str = PICKLE_STORAGE_PATH) -> bool:
     """
     Saves AddressBook to pickle file.
+    Returns True if the file was written.
     """
     if path != PICKLE_STORAGE_PATH:
         os.makedirs(os.path.dirname(path), exist_ok=True)
 
+    import pickle
     try:
-        with open(path, 'wb') as f:
+        with atomic_write(path, 'wb') as f:
             pickle.dump(book, f)
     except Exception as e:
         print(f"Error saving pickle data: {e}")
+        return False
+    return True
+
+
+def load_snapshot() -> Optional[AddressBook]:
+    """
+    Opens the binary snapshot lazily (records are decoded on access).
+    Returns AddressBook or None if failed/missing.
+    """
+    try:
+        book = snapshot.open_snapshot(SNAPSHOT_STORAGE_PATH)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Failed to load snapshot (falling back): {e}")
+        return None
+
+    if book is None:
+        return None
 
+    # The lazy view only replaces the dict backend; other backends load in full.
+    if ADDRESS_BOOK_BACKEND != 'dict':
+        converted = new_address_book()
+        converted.update(book.data)
+        converted.pop_changes()
+        book = converted
+
+    _mark_loaded(book, "snapshot")
+    return book
+
+
+def save_snapshot(book: AddressBook, path: str = SNAPSHOT_STORAGE_PATH) -> bool:
+    """
+    Saves AddressBook as a binary snapshot.
+    Returns True if the file was written.
+    """
+    try:
+        snapshot.write_snapshot(book, path)
+    except Exception as e:
+        print(f"Error saving snapshot: {e}")
+        return False
+    return True
+
+
+def save_csv(book: AddressBook) -> bool:
+    """
+    Saves AddressBook as the CSV backup.
+    Returns True if the file was written.
+    """
+    from assistant_bot.import_export import export_file
+
+    try:
+        export_file(book, CSV_STORAGE_PATH)
+    except Exception as e:
+        print(f"Error syncing CSV: {e}")
+        return False
+    return True
 
+
+# Persisted formats in save order: (manifest key, path, writer)
+_FORMATS: List[Tuple[str, str, Callable[[AddressBook], bool]]] = [
+    ("json", JSON_STORAGE_PATH, save_address_book),
+    ("pickle", PICKLE_STORAGE_PATH, save_pickle),
+    ("csv", CSV_STORAGE_PATH, save_csv),
+    ("snapshot", SNAPSHOT_STORAGE_PATH, save_snapshot),
+]
+
+
+@stats.timed('persist.save_all')
 def save_all(book: AddressBook) -> None:
     """
     Strictly synchronizes AddressBook state across all formats:
     - JSON (Legacy/Human Readable)
     - PKL (Persistence)
     - CSV (Export/Backup)
+    - SNAP (Binary snapshot, opened lazily on startup)
+    A format is rewritten only if the book changed since the last save or
+    its file no longer matches the manifest, so an idle session writes nothing.
+    The journal is then cut back to the entries written after the rows were
+    captured, as the snapshots cover everything before.
+    If any write fails, the book stays dirty and the journal is kept, so the
+    changes are still replayed on the next start and the next save retries.
+
+    Only capturing the rows and recording the result hold locked(); the files
+    are written in between, so commands are not blocked by a compaction.
+    Called from a command (which already holds locked()), the whole save runs
+    under the lock.
     """
-    # 1. Save JSON
-    save_address_book(book)
+    global _journal_entries, _last_compaction, _saving
 
-    # 2. Save Pickle
-    save_pickle(book)
+    with _book_lock:
+        _save_done.wait_for(lambda: not _saving)
+        _saving = True
+        manifest = _read_manifest()
+        stale = [
+            (key, path, writer) for key, path, writer in _FORMATS
+            if book.dirty or not _is_fresh(manifest, key, path)
+        ]
+        dirty = book.dirty
+        generation = book.generation
+        changes = book.pop_changes()
+        covered_entries = _journal_entries
+        covered_length = journal.size()
+        rows = list(book.iter_rows()) if stale else []
 
-    # 3. Save CSV
+    saved = False
     try:
-        export_file(book, CSV_STORAGE_PATH)
-    except Exception as e:
-        print(f"Error syncing CSV: {e}")
+        saved = _write_formats(manifest, stale, rows, dirty)
+    finally:
+        with _book_lock:
+            _saving = False
+            _save_done.notify_all()
+            if not saved:
+                book.restore_changes(changes)
+            else:
+                book.mark_saved(generation)
+                journal.discard_prefix(covered_length)
+                _journal_entries -= covered_entries
+                _last_compaction = time.monotonic()
+
+
+def _write_formats(manifest: Dict[str, Any], stale: List[Tuple[str, str, Callable[[AddressBook], bool]]],
+                   rows: List[Any], dirty: bool) -> bool:
+    """
+    Writes the stale formats and the manifest from rows captured by save_all.
+    Returns True if every file was written.
+    """
+    # The writers get a detached copy, so the live book can change meanwhile.
+    copy = new_address_book()
+    copy.load_records(
+        record_from_trusted_dict(name, {"phones": phones, "email": email, "birthday": birthday, "notes": notes, "tags": tags})
+        for name, phones, email, birthday, notes, tags in rows
+    )
+
+    # 1-4. Save JSON, Pickle, CSV and Binary Snapshot (stale ones only)
+    # A file that failed to write still holds older data: drop it from
+    # the manifest so it is no longer loaded first or trusted.
+    saved = True
+    for key, path, writer in stale:
+        entry = _file_entry(path) if writer(copy) else None
+        if entry is None:
+            saved = False
+            manifest["files"].pop(key, None)
+        else:
+            manifest["files"][key] = entry
+
+    # 5. Update Manifest
+    manifest["format"] = STORAGE_FORMAT_VERSION
+    if stale:
+        if dirty:
+            manifest["revision"] += 1
+        saved = _write_manifest(manifest) and saved
+    return saved
+
+
+def save_changes(book: AddressBook) -> None:
+    """
+    Signals that the book changed. This is the per-command persistence path:
+    it returns immediately and the background writer journals the changes.
+    """
+    _worker.notify(book)
+
+
+def flush(timeout: Optional[float] = None) -> bool:
+    """
+    Waits until every signalled change is written.
+    Must not be called while holding locked(). Returns False on timeout.
+    """
+    return _worker.flush(timeout)
+
+
+@contextmanager
+def deferred() -> Iterator[None]:
+    """
+    Holds back the background writer for a batch of commands: changes
+    signalled inside the block are written once, when it exits (or on flush()).
+    """
+    _worker.pause()
+    try:
+        yield
+    finally:
+        _worker.resume()
+
+
+def _write_changes(book: AddressBook) -> None:
+    """
+    Appends the records changed since the last call to the journal, then
+    folds the journal into the full snapshots once it grows or ages.
+    """
+    global _journal_entries
+
+    with _book_lock:
+        try:
+            with stats.timed('persist.journal'):
+                entries = []
+                for name in book.pop_changes():
+                    record = book.find(name)
+                    if record is None:
+                        entries.append({"op": journal.OP_DELETE, "name": name})
+                    else:
+                        entries.append({"op": journal.OP_UPSERT, "name": name, "record": record_to_dict(record)})
+                journal.append_entries(entries)
+        except OSError as e:
+            print(f"Error writing journal, falling back to full save: {e}")
+            entries = None
+        else:
+            _journal_entries += len(entries)
+
+    # Outside the lock, so the snapshot files are written without blocking commands.
+    if entries is None:
+        save_all(book)
+    else:
+        _compact_if_due(book)
+
+
+def _compact_if_due(book: AddressBook) -> None:
+    """Folds the journal into the full snapshots if _compaction_due()."""
+    if _compaction_due():
+        save_all(book)
+
+
+@stats.timed('persist.replay')
+def replay_journal(book: AddressBook) -> int:
+    """
+    Re-applies journaled operations on top of a loaded snapshot.
+    Returns the number of entries applied.
+    """
+    global _journal_entries
+
+    applied = 0
+    for entry in journal.read_entries():
+        name = entry.get('name')
+        if not isinstance(name, str):
+            continue
+
+        if entry.get('op') == journal.OP_DELETE:
+            book.delete(name)
+        elif entry.get('op') == journal.OP_UPSERT and isinstance(entry.get('record'), dict):
+            try:
+                book.add_record(record_from_dict(name, entry['record']))
+            except ValueError as e:
+                print(f"Skipping invalid journal entry '{name}': {e}")
+                continue
+        else:
+            continue
+        applied += 1
+
+    # Replayed changes are already on disk (in the journal).
+    book.pop_changes()
+    _journal_entries = applied
+    return applied
+
+
+# --- Manifest ---
+
+def _read_manifest() -> Dict[str, Any]:
+    """
+    Returns {"format": int, "revision": int, "files": {key: {"size", "mtime_ns", "sha256"}}}.
+    A missing or unreadable manifest is treated as empty (every format stale).
+    """
+    try:
+        with open(MANIFEST_STORAGE_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if isinstance(manifest.get("revision"), int) and isinstance(manifest.get("files"), dict):
+            return manifest
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {"revision": 0, "files": {}}
+
+
+def _write_manifest(manifest: Dict[str, Any]) -> bool:
+    try:
+        os.makedirs(DATA_DIR, exist_ok=True)
+        with atomic_write(MANIFEST_STORAGE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+    except OSError as e:
+        print(f"Error saving manifest: {e}")
+        return False
+    return True
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _file_entry(path: str) -> Optional[Dict[str, Any]]:
+    """Describes a written file for the manifest, or None if it is missing."""
+    try:
+        stat = os.stat(path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _sha256(path)}
+    except OSError:
+        return None
+
+
+def _is_fresh(manifest: Dict[str, Any], key: str, path: str) -> bool:
+    """
+    True if the file still holds what the manifest recorded.
+    Size and mtime decide; the content hash is only computed if the file was touched.
+    """
+    entry = manifest["files"].get(key)
+    if not isinstance(entry, dict) or manifest.get("format") != STORAGE_FORMAT_VERSION:
+        return False
+    try:
+        stat = os.stat(path)
+        if stat.st_size != entry.get("size"):
+            return False
+        if stat.st_mtime_ns == entry.get("mtime_ns"):
+            return True
+        return _sha256(path) == entry.get("sha256")
+    except OSError:
+        return False
+
+
+def _is_trusted(manifest: Dict[str, Any], key: str, content: bytes) -> bool:
+    """
+    True if 'content' is exactly what save_all wrote for 'key' in the current
+    STORAGE_FORMAT_VERSION, so its records can skip validation.
+    """
+    entry = manifest["files"].get(key)
+    return (
+        manifest.get("format") == STORAGE_FORMAT_VERSION
+        and isinstance(entry, dict)
+        and entry.get("sha256") == hashlib.sha256(content).hexdigest()
+    )
+
+
+def _mark_loaded(book: AddressBook, key: str, fresh: Optional[bool] = None) -> None:
+    """
+    Marks a freshly loaded book as saved if its source file matches the manifest
+    ('fresh' may pass an already computed check).
+    Otherwise the other formats may hold different data, so the book stays dirty.
+    """
+    if fresh is None:
+        path = next(p for k, p, _ in _FORMATS if k == key)
+        fresh = _is_fresh(_read_manifest(), key, path)
+    if fresh:
+        book.mark_saved()
+    else:
+        book.mark_dirty()
+
+
+def _compaction_due() -> bool:
+    """True if the journal is large or old enough to be folded into the snapshots."""
+    if _journal_entries == 0:
+        return False
+
+    is_large = _journal_entries >= JOURNAL_COMPACT_THRESHOLD
+    is_old = time.monotonic() - _last_compaction >= JOURNAL_COMPACT_INTERVAL
+    return is_large or is_old
+
+
+# --- Background Persistence ---
+
+class PersistenceWorker:
+    """
+    Daemon thread that turns "book changed" signals into journal writes.
+    Signals arriving within PERSIST_DEBOUNCE_SECONDS of the first one are
+    coalesced into a single write; flush() skips the wait and blocks until
+    everything signalled so far is on disk. While paused, signals only
+    accumulate until resume() or flush(). When idle, the writer still wakes
+    every JOURNAL_COMPACT_INTERVAL so an aged journal gets compacted.
+    """
+
+    def __init__(self, debounce: float = PERSIST_DEBOUNCE_SECONDS):
+        self._debounce = debounce
+        self._cond = threading.Condition()
+        self._book: Optional[AddressBook] = None
+        self._pending = False
+        self._busy = False
+        self._flush_requested = False
+        self._paused = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def notify(self, book: AddressBook) -> None:
+        with self._cond:
+            self._book = book
+            self._pending = True
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="persistence-writer", daemon=True)
+                self._thread.start()
+            # While paused the writer has nothing to do; resume() wakes it.
+            if not self._paused:
+                self._cond.notify_all()
+
+    def pause(self) -> None:
+        with self._cond:
+            self._paused += 1
+
+    def resume(self) -> None:
+        with self._cond:
+            self._paused -= 1
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            if self._pending:
+                self._flush_requested = True
+                self._cond.notify_all()
+            return self._cond.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                has_changes = self._cond.wait_for(
+                    lambda: self._pending and (not self._paused or self._flush_requested),
+                    JOURNAL_COMPACT_INTERVAL
+                )
+                if has_changes:
+                    # Debounce: let a burst of commands share one write.
+                    self._cond.wait_for(lambda: self._flush_requested, self._debounce)
+                    self._pending = False
+                    self._flush_requested = False
+                elif self._book is None or self._paused:
+                    continue
+                book = self._book
+                self._busy = True
+
+            try:
+                if has_changes:
+                    _write_changes(book)
+                else:
+                    _compact_if_due(book)
+            except Exception as e:
+                print(f"Error persisting changes: {e}")
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+
+_worker = PersistenceWorker()
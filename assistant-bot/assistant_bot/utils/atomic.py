@@ -0,0 +1,55 @@
+import os
+from contextlib import contextmanager
+from typing import Any, IO, Iterator
+
+TMP_SUFFIX = '.tmp'
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w', **kwargs: Any) -> Iterator[IO[Any]]:
+    """
+    Writes 'path' all-or-nothing.
+
+    Data goes to a temporary file next to 'path', which is fsynced and then
+    renamed over the target; the directory is fsynced so the rename survives
+    a crash too. If writing fails, the target is left untouched.
+
+    Args:
+        path: Destination file.
+        mode: 'w' or 'wb' (plus any open() keyword arguments).
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = path + TMP_SUFFIX
+
+    try:
+        with open(tmp_path, mode, **kwargs) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persists a rename in 'directory' (not supported on every platform)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+__all__ = ['atomic_write']
@@ -1,9 +1,12 @@
+import json
 import random
-from typing import Dict, Tuple, Any
+from typing import Dict, Tuple, Any, Iterable, Sequence
 
 from rich.console import Console
 from rich.theme import Theme
 
+from assistant_bot.utils.stats import timed
+
 # --- Configuration ---
 # Custom theme for consistent, professional branding
 THEME_CONFIG = {
@@ -15,14 +18,50 @@ THEME_CONFIG = {
     "highlight": "bold white"
 }
 
+
+class TimedConsole(Console):
+    """
+    Console that reports the time spent printing as the 'render' section (see the stats command).
+    When 'quiet' is set, output is dropped before it is rendered.
+    """
+
+    @timed('render')
+    def print(self, *args: Any, **kwargs: Any) -> None:
+        if self.quiet:
+            return
+        super().print(*args, **kwargs)
+
+
 custom_theme = Theme(THEME_CONFIG)
-console = Console(theme=custom_theme)
+console = TimedConsole(theme=custom_theme)
+
+# Plain (machine-readable) output formats, see write_rows
+PLAIN_FORMATS = ('tsv', 'ndjson')
+PLAIN_WRITE_BATCH = 1000  # lines joined per write
+
+
+# Error messages printed so far, and the latest one (see errors_printed)
+_errors_printed = 0
+_last_error = ''
 
 
 # --- Output Helpers ---
 
+def errors_printed() -> int:
+    """Number of error messages printed so far (also when quiet); batch runs use it to spot failed lines."""
+    return _errors_printed
+
+
+def last_error() -> str:
+    """Text of the latest error message, without markup."""
+    return _last_error
+
+
 def print_error(msg: str) -> None:
     """Displays an error message with a cross icon."""
+    global _errors_printed, _last_error
+    _errors_printed += 1
+    _last_error = msg
     console.print(f"[error]❌ {msg}[/error]")
 
 
@@ -51,6 +90,7 @@ def print_duplicate_error(owner_name: str, owner_data: Dict[str, Any], value: st
         value: The conflicting value (email or phone).
         messages: A tuple of potential error messages to choose from.
     """
+    global _errors_printed, _last_error
     msg = random.choice(messages)
     
     try:
@@ -59,5 +99,58 @@ def print_duplicate_error(owner_name: str, owner_data: Dict[str, Any], value: st
     except (IndexError, KeyError, ValueError):
         # Fallback to raw message if placeholder mismatch occurs
         formatted_msg = msg
-        
+
+    _errors_printed += 1
+    _last_error = f"{formatted_msg} (Owned by: {owner_name})"
     console.print(f"[error]❌ {formatted_msg}[/error] (Owned by: [bold]{owner_name}[/bold])")
+
+
+# --- Plain Output ---
+
+_TSV_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+_TSV_FIELD = str.maketrans(_TSV_ESCAPES)
+_TSV_ITEM = str.maketrans({**_TSV_ESCAPES, '|': '\\|'})
+
+
+def _tsv_field(value: Any) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, (list, tuple)):
+        return '|'.join(str(item).translate(_TSV_ITEM) for item in value)
+    return str(value).translate(_TSV_FIELD)
+
+
+@timed('render')
+def write_rows(fmt: str, fields: Sequence[str], rows: Iterable[Sequence[Any]]) -> None:
+    """
+    Streams rows to the console's file without rich rendering.
+
+    Args:
+        fmt: 'tsv' (header line, then one tab-separated line per row; lists
+            are joined with '|', and tabs, newlines and '|' inside list items
+            are backslash-escaped) or 'ndjson' (one JSON object per row,
+            lists and nulls kept).
+        fields: Field names, in row order.
+        rows: Row values (str, int, None or a sequence of str).
+    """
+    if console.quiet:
+        return
+    out = console.file
+    lines = []
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+
+    def format_row(row: Sequence[Any]) -> str:
+        if fmt == 'tsv':
+            return '\t'.join(map(_tsv_field, row)) + '\n'
+        return encode(dict(zip(fields, row))) + '\n'
+
+    if fmt == 'tsv':
+        lines.append('\t'.join(fields) + '\n')
+
+    for row in rows:
+        lines.append(format_row(row))
+        if len(lines) >= PLAIN_WRITE_BATCH:
+            out.write(''.join(lines))
+            lines.clear()
+    out.write(''.join(lines))
+    out.flush()
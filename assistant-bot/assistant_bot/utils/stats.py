@@ -0,0 +1,183 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import cProfile
+
+# Upper bounds (seconds) of the timing histogram buckets; one more bucket
+# collects everything slower.
+TIMING_BUCKETS = (0.001, 0.01, 0.1, 1.0)
+CAPTURE_MODES = ('cprofile', 'tracemalloc')
+TRACEMALLOC_FRAMES = 10  # stack depth recorded per allocation
+
+
+class Timing:
+    """Call count, total/max seconds and a histogram for one timed name."""
+    __slots__ = ('calls', 'total', 'max', 'buckets')
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(TIMING_BUCKETS) + 1)
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(TIMING_BUCKETS):
+            if seconds < bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+
+# --- Counters & Timings ---
+#
+# commands: dispatch time per command, parsing and lock waits included.
+# sections: time inside parts of the app (render, persist.*), from any thread.
+# counters: 'index.<query>' for answers served by an index, 'scan.<what>'
+#           for passes over every contact.
+
+commands: Dict[str, Timing] = {}
+sections: Dict[str, Timing] = {}
+counters: Dict[str, int] = {}
+_lock = threading.Lock()
+
+
+def count(name: str, n: int = 1) -> None:
+    """Increments a counter (cheap enough for every model query)."""
+    counters[name] = counters.get(name, 0) + n
+
+
+def add_time(table: Dict[str, Timing], name: str, seconds: float) -> None:
+    with _lock:
+        timing = table.get(name)
+        if timing is None:
+            timing = table[name] = Timing()
+        timing.add(seconds)
+
+
+@contextmanager
+def timed(section: str) -> Iterator[None]:
+    """Adds the time spent in the block (or decorated function) to 'section'."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(sections, section, time.perf_counter() - started)
+
+
+def reset() -> None:
+    """Starts a new measurement window (captures keep running)."""
+    with _lock:
+        commands.clear()
+        sections.clear()
+        counters.clear()
+
+
+def rows() -> List[Tuple[str, str, int, Optional[float], Optional[float], Optional[List[int]]]]:
+    """
+    Returns (group, name, calls, total ms, max ms, histogram) per metric.
+    Counters have no times or histogram.
+    """
+    result = []
+    with _lock:
+        for group, table in (('command', commands), ('section', sections)):
+            for name in sorted(table):
+                t = table[name]
+                result.append((group, name, t.calls, t.total * 1000, t.max * 1000, list(t.buckets)))
+        for name in sorted(counters):
+            result.append(('counter', name, counters[name], None, None, None))
+    return result
+
+
+# --- Capture (cProfile / tracemalloc) ---
+
+_capture_mode: Optional[str] = None
+_capture_path: Optional[str] = None
+_profiler: Optional['cProfile.Profile'] = None
+
+
+def start_capture(mode: str, path: str) -> None:
+    """
+    Starts capturing into 'path' until stop_capture().
+    'cprofile' profiles command execution only (see profiled), so idle time
+    at the prompt is not recorded; 'tracemalloc' traces every allocation.
+    """
+    global _capture_mode, _capture_path, _profiler
+    if mode not in CAPTURE_MODES:
+        raise ValueError(f"Unknown capture mode '{mode}' (use {' or '.join(CAPTURE_MODES)})")
+    if _capture_mode is not None:
+        raise ValueError(f"A {_capture_mode} capture is already running")
+
+    # Imported here: the profilers are only needed once a capture starts
+    if mode == 'cprofile':
+        import cProfile
+        _profiler = cProfile.Profile()
+    else:
+        import tracemalloc
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    _capture_mode, _capture_path = mode, path
+
+
+def stop_capture() -> Optional[str]:
+    """
+    Stops the running capture and writes its file: pstats data for
+    'cprofile', a tracemalloc.Snapshot dump for 'tracemalloc'.
+    Returns the path written, or None if nothing was running.
+    """
+    global _capture_mode, _capture_path, _profiler
+    mode, path = _capture_mode, _capture_path
+    if mode is None or path is None:
+        return None
+    _capture_mode = _capture_path = None
+
+    if mode == 'cprofile':
+        profiler, _profiler = _profiler, None
+        profiler.dump_stats(path)
+    else:
+        import tracemalloc
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        snapshot.dump(path)
+    return path
+
+
+def capture_status() -> Optional[Tuple[str, str]]:
+    """Returns (mode, path) of the running capture, or None."""
+    if _capture_mode is None or _capture_path is None:
+        return None
+    return _capture_mode, _capture_path
+
+
+@contextmanager
+def profiled() -> Iterator[None]:
+    """Runs the block under the cProfile capture, if one is running."""
+    profiler = _profiler
+    if profiler is None:
+        yield
+        return
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+
+
+__all__ = [
+    'TIMING_BUCKETS',
+    'CAPTURE_MODES',
+    'Timing',
+    'count',
+    'add_time',
+    'timed',
+    'reset',
+    'rows',
+    'start_capture',
+    'stop_capture',
+    'capture_status',
+    'profiled',
+]
@@ -1,4 +1,6 @@
 import re
+from datetime import date
+from typing import Iterable, List, Optional
 
 # Constants
 # Strict Ukrainian phone format: +38 followed by 10 digits
@@ -6,6 +8,11 @@ PHONE_VALIDATION_PATTERN = r'^\+38\d{10}$'
 # Basic email validation: Must contain @ and . with no spaces
 EMAIL_VALIDATION_PATTERN = r'^[^@\s]+@[^@\s]+\.[^@\s]+$'
 
+# Compiled once: these run for every phone and email that is stored or imported.
+_NON_DIGITS_RE = re.compile(r"\D")
+_PHONE_RE = re.compile(PHONE_VALIDATION_PATTERN)
+_EMAIL_RE = re.compile(EMAIL_VALIDATION_PATTERN)
+
 
 def normalize_phone(phone: str) -> str:
     """
@@ -21,7 +28,7 @@ def normalize_phone(phone: str) -> str:
         return ''
     
     # Remove all non-digit characters
-    digits = re.sub(r"\D", "", phone)
+    digits = _NON_DIGITS_RE.sub("", phone)
     
     # Case 1: 10 digits (e.g. 0501234567) -> Add +38 (Implicit UA)
     if len(digits) == 10:
@@ -35,6 +42,74 @@ def normalize_phone(phone: str) -> str:
     return f"+{digits}"
 
 
+def normalize_valid_phone(phone: str) -> Optional[str]:
+    """
+    Normalizes and validates a phone number in a single pass.
+    
+    Args:
+        phone: Raw phone number string.
+        
+    Returns:
+        The normalized phone (+380...) if valid, None otherwise.
+    """
+    if not phone:
+        return None
+    
+    digits = _NON_DIGITS_RE.sub("", phone)
+    normalized = f"+38{digits}" if len(digits) == 10 else f"+{digits}"
+    return normalized if _PHONE_RE.match(normalized) else None
+
+
+def pack_phone(phone: str) -> Optional[int]:
+    """
+    Packs a phone number into an int (the 12 digits after '+').
+    
+    Args:
+        phone: Raw phone number string.
+        
+    Returns:
+        The packed number if the phone is valid, None otherwise.
+    """
+    if not phone:
+        return None
+    
+    # Same rule as PHONE_VALIDATION_PATTERN, checked on the digits directly
+    digits = _NON_DIGITS_RE.sub("", phone)
+    if len(digits) == 10:
+        digits = f"38{digits}"
+    if len(digits) != 12 or not digits.startswith("38"):
+        return None
+    return int(digits)
+
+
+def format_phone(number: int) -> str:
+    """
+    Formats a packed phone number back to its normalized '+38...' string.
+    
+    Args:
+        number: Packed phone number.
+        
+    Returns:
+        Normalized phone string.
+    """
+    return f"+{number}"
+
+
+def format_birthday(value: date) -> str:
+    """
+    Formats a birthday as DD-MM-YYYY.
+    Unlike strftime, the year is always padded to four digits, so the
+    result parses back with strptime and fixed-width slicing.
+    
+    Args:
+        value: Birthday date.
+        
+    Returns:
+        Birthday string.
+    """
+    return f"{value.day:02d}-{value.month:02d}-{value.year:04d}"
+
+
 def validate_phone(phone: str) -> bool:
     """
     Validates if a phone number matches the strict strict Ukrainian format (+380...).
@@ -45,8 +120,7 @@ def validate_phone(phone: str) -> bool:
     Returns:
         True if valid, False otherwise.
     """
-    normalized_phone = normalize_phone(phone)
-    return bool(re.match(PHONE_VALIDATION_PATTERN, normalized_phone))
+    return normalize_valid_phone(phone) is not None
 
 
 def validate_email(email: str) -> bool:
@@ -62,7 +136,56 @@ def validate_email(email: str) -> bool:
     if not email:
         return False
         
-    return bool(re.match(EMAIL_VALIDATION_PATTERN, email))
+    return _EMAIL_RE.match(email) is not None
+
+
+# --- Batch APIs ---
+
+def normalize_phones(phones: Iterable[str]) -> List[Optional[str]]:
+    """
+    Normalizes and validates many phone numbers at once.
+    
+    Args:
+        phones: Raw phone number strings.
+        
+    Returns:
+        One entry per input: the normalized phone, or None if it is invalid.
+    """
+    strip, match = _NON_DIGITS_RE.sub, _PHONE_RE.match
+    result: List[Optional[str]] = []
+    append = result.append
+    for phone in phones:
+        if not phone:
+            append(None)
+            continue
+        digits = strip("", phone)
+        normalized = f"+38{digits}" if len(digits) == 10 else f"+{digits}"
+        append(normalized if match(normalized) else None)
+    return result
+
+
+def validate_emails(emails: Iterable[str]) -> List[bool]:
+    """
+    Validates many email addresses at once.
+    
+    Args:
+        emails: Email address strings.
+        
+    Returns:
+        One flag per input.
+    """
+    match = _EMAIL_RE.match
+    return [bool(email) and match(email) is not None for email in emails]
 
 
-__all__ = ['normalize_phone', 'validate_phone', 'validate_email']
+__all__ = [
+    'normalize_phone',
+    'normalize_valid_phone',
+    'pack_phone',
+    'format_phone',
+    'format_birthday',
+    'validate_phone',
+    'validate_email',
+    'normalize_phones',
+    'validate_emails',
+]
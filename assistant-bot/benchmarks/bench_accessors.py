@@ -0,0 +1,96 @@
+"""
+Accessor benchmark: allocations of Record.phones/notes/tags reads and the
+cost of the contact table renderers that read them in per-row loops.
+
+Usage:
+    python benchmarks/bench_accessors.py [--count N] [--json]
+"""
+import os
+import sys
+import gc
+import json
+import time
+import argparse
+import tracemalloc
+from typing import Dict, Any
+
+# Ensure the package is importable when running from the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_data import generate_address_book
+from assistant_bot import commands
+from assistant_bot.utils.console import console
+
+
+def measure_reads(book) -> Dict[str, Any]:
+    """Bytes allocated per accessor read, keeping every result alive."""
+    records = list(book.data.values())
+    reads = len(records) * 3
+    kept = [None] * reads
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    i = 0
+    for r in records:
+        kept[i] = r.phones
+        kept[i + 1] = r.notes
+        kept[i + 2] = r.tags
+        i += 3
+    allocated = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    return {
+        "reads": reads,
+        "bytes_per_read": round(allocated / max(reads, 1), 1),
+    }
+
+
+def measure_renderer(name: str, render) -> Dict[str, Any]:
+    """Wall time (untraced run) and peak traced memory (traced run) of a renderer."""
+    gc.collect()
+    start = time.perf_counter()
+    render()
+    elapsed = time.perf_counter() - start
+
+    gc.collect()
+    tracemalloc.start()
+    render()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"renderer": name, "seconds": round(elapsed, 4), "peak_bytes": peak}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure Record accessor allocations.")
+    parser.add_argument("--count", type=int, default=2_000, help="Number of contacts to generate")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    book = generate_address_book(args.count)
+    console.file = open(os.devnull, 'w', encoding='utf-8')
+
+    result = {
+        "benchmark": "accessors",
+        "count": len(book),
+        "reads": measure_reads(book),
+        "renderers": [
+            measure_renderer("list", lambda: commands.handle_list(book, [])),
+            measure_renderer("all", lambda: commands.handle_all(book, [])),
+            measure_renderer("filter_by_tag", lambda: commands.handle_filter_by_tag(book, ["work"])),
+            measure_renderer("birthdays", lambda: commands.handle_birthdays(book, ["60"])),
+        ],
+    }
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    reads = result["reads"]
+    print(f"{result['count']} records: {reads['bytes_per_read']} bytes allocated per accessor read")
+    for r in result["renderers"]:
+        print(f"  {r['renderer']:<14} {r['seconds']:.3f}s  peak {r['peak_bytes'] / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Import benchmark: rows/s of import_file for 1..N worker processes.
+
+Usage:
+    python benchmarks/bench_import.py [--count N] [--format csv|json] [--workers 1,2,4] [--json]
+
+Exports a generated book once, then imports it with each worker count and
+reports the speedup over the sequential (1 worker) import.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from typing import Dict, Any, List
+
+# Ensure the package is importable when running from the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_data import generate_address_book
+from assistant_bot.models import AddressBook
+from assistant_bot import import_export
+
+
+def default_workers() -> List[int]:
+    """1, 2, 4, ... up to the number of CPUs (always including it)."""
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 < cpus:
+        counts.append(counts[-1] * 2)
+    if cpus > 1:
+        counts.append(cpus)
+    return counts
+
+
+def measure(path: str, workers: int) -> Dict[str, Any]:
+    """Imports 'path' into an empty book with the given number of workers."""
+    book = AddressBook()
+    started = time.perf_counter()
+    import_export.import_file(book, path, workers=workers)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "workers": workers,
+        "count": len(book),
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(len(book) / elapsed),
+    }
+
+
+def run(count: int, fmt: str, workers: List[int]) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"contacts.{fmt}")
+        import_export.export_file(generate_address_book(count), path)
+        size = os.path.getsize(path)
+        results = [measure(path, n) for n in workers]
+
+    baseline = results[0]["seconds"]
+    for result in results:
+        result["speedup"] = round(baseline / result["seconds"], 2)
+
+    return {
+        "benchmark": "import",
+        "format": fmt,
+        "count": count,
+        "file_bytes": size,
+        "cpus": os.cpu_count(),
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure import throughput across worker counts.")
+    parser.add_argument("--count", type=int, default=200_000, help="Number of contacts to generate")
+    parser.add_argument("--format", choices=["csv", "json"], default="csv", help="Import file format")
+    parser.add_argument("--workers", default=None, help="Comma-separated worker counts (default: 1,2,4..CPUs)")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    workers = [int(n) for n in args.workers.split(",")] if args.workers else default_workers()
+    report = run(args.count, args.format, workers)
+
+    if args.json:
+        print(json.dumps(report))
+        return
+
+    print(f"[{report['format']}] {report['count']} contacts, {report['file_bytes'] / 1024 / 1024:.1f} MiB, "
+          f"{report['cpus']} CPUs")
+    for result in report["results"]:
+        print(f"  {result['workers']:>3} workers: {result['seconds']:>7.2f}s "
+              f"{result['rows_per_second']:>10,} rows/s  x{result['speedup']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Memory benchmark: bytes per record for books built by generate_data.
+
+Usage:
+    python benchmarks/bench_memory.py [--count N] [--backend dict|columnar] [--json]
+
+Every run also measures the same book with a __dict__-based reference layout
+(the Record/field classes as they were before __slots__), so the saving is
+reported without checking out an older commit.
+"""
+import os
+import sys
+import gc
+import json
+import argparse
+import tracemalloc
+from typing import Dict, Any, Optional, Tuple
+
+# Ensure the package is importable when running from the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_data import generate_address_book
+from assistant_bot.models import AddressBook, Record
+from assistant_bot.columnar import ColumnarAddressBook
+
+BACKENDS = {
+    "dict": AddressBook,
+    "columnar": ColumnarAddressBook,
+}
+
+
+# --- __dict__ Reference Layout ---
+
+class _DictField:
+    """Field before __slots__: the value lives in a per-instance __dict__."""
+
+    def __init__(self, value: str):
+        self.value = value
+
+
+class _DictBirthday(_DictField):
+    """Birthday before __slots__: keeps the string and the parsed date."""
+
+    def __init__(self, value: str, date_obj: Any):
+        super().__init__(value)
+        self.date_obj = date_obj
+
+
+class _DictRecord:
+    """Record before __slots__, holding the same data as 'record'."""
+
+    def __init__(self, record: Record, book: Optional[AddressBook]):
+        self.name = _DictField(record.name.value)
+        self._phones = [_DictField(phone.value) for phone in record.phones]
+        self.email = _DictField(record.email.value) if record.email else None
+        self.birthday = _DictBirthday(record.birthday.value, record.birthday.date_obj) if record.birthday else None
+        self._notes = list(record.notes)
+        self._tags = list(record.tags)
+        self._book = book
+
+
+def _to_reference_layout(book: AddressBook) -> None:
+    """Swaps every stored record for its __dict__ equivalent (indexes are left as they are)."""
+    for name, record in list(book.data.items()):
+        book.data[name] = _DictRecord(record, book)
+
+
+# --- Measurement ---
+
+def _retained(count: int, backend: str, reference: bool = False) -> Tuple[int, int]:
+    """Builds a book of 'count' contacts and returns (retained bytes, records)."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    book = generate_address_book(count, BACKENDS[backend]())
+    if reference:
+        _to_reference_layout(book)
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    return retained, len(book)
+
+
+def measure(count: int, backend: str = "dict") -> Dict[str, Any]:
+    """
+    Reports the memory retained by a book of 'count' contacts, next to the
+    same dict-backed book with the __dict__ reference layout.
+    """
+    retained, records = _retained(count, backend)
+    reference, reference_records = _retained(count, "dict", reference=True)
+
+    return {
+        "benchmark": "memory",
+        "backend": backend,
+        "count": records,
+        "retained_bytes": retained,
+        "bytes_per_record": round(retained / max(records, 1), 1),
+        "reference_bytes_per_record": round(reference / max(reference_records, 1), 1),
+        "saved_percent": round(100 * (1 - retained / max(reference, 1)), 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure AddressBook memory per record.")
+    parser.add_argument("--count", type=int, default=100_000, help="Number of contacts to generate")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), default="dict", help="AddressBook backend")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    result = measure(args.count, args.backend)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"[{result['backend']}] {result['count']} records: {result['bytes_per_record']} bytes/record "
+              f"({result['retained_bytes'] / 1024 / 1024:.1f} MiB retained)")
+        print(f"[__dict__ reference] {result['reference_bytes_per_record']} bytes/record "
+              f"({result['saved_percent']}% saved)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Validator benchmark: per-item cost of phone/email validation.
+
+Usage:
+    python benchmarks/bench_validators.py [--count N] [--repeat R] [--json]
+
+Compares the two-step path Phone used to take (validate_phone, then
+normalize_phone again) with the single-pass normalize_valid_phone and the
+normalize_phones / validate_emails batch APIs. Times are best of 'repeat'
+runs, in nanoseconds per item.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from typing import Any, Callable, Dict, List
+
+# Ensure the package is importable when running from the project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from generate_data import generate_phone, generate_email, FIRST_NAMES
+from assistant_bot.utils.validators import (
+    normalize_phone,
+    normalize_valid_phone,
+    validate_phone,
+    validate_email,
+    normalize_phones,
+    validate_emails,
+)
+
+
+def make_inputs(count: int) -> Dict[str, List[str]]:
+    """Phones in the spellings users type them, plus ~5% invalid values."""
+    random.seed(count)
+    phones, emails = [], []
+    for i in range(count):
+        phone = generate_phone()
+        style = i % 4
+        if style == 1:
+            phone = phone[3:]                                      # 0501234567
+        elif style == 2:
+            phone = f"{phone[:3]} ({phone[3:6]}) {phone[6:9]}-{phone[9:]}"
+        elif style == 3:
+            phone = phone[1:]                                      # 380501234567
+        if i % 20 == 0:
+            phone = phone[:-3]
+        phones.append(phone)
+
+        email = generate_email(random.choice(FIRST_NAMES), i)
+        emails.append(email.replace("@", " at ") if i % 20 == 0 else email)
+    return {"phones": phones, "emails": emails}
+
+
+def best_ns_per_item(func: Callable[[], Any], count: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return round(best / count * 1e9, 1)
+
+
+def run(count: int, repeat: int) -> Dict[str, Any]:
+    inputs = make_inputs(count)
+    phones, emails = inputs["phones"], inputs["emails"]
+
+    def two_step() -> None:
+        for phone in phones:
+            if validate_phone(phone):
+                normalize_phone(phone)
+
+    cases = {
+        "phone_two_step": two_step,
+        "phone_single_pass": lambda: [normalize_valid_phone(phone) for phone in phones],
+        "phone_batch": lambda: normalize_phones(phones),
+        "email_single": lambda: [validate_email(email) for email in emails],
+        "email_batch": lambda: validate_emails(emails),
+    }
+    results = {name: best_ns_per_item(func, count, repeat) for name, func in cases.items()}
+
+    return {
+        "benchmark": "validators",
+        "count": count,
+        "repeat": repeat,
+        "ns_per_item": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure per-item validator cost.")
+    parser.add_argument("--count", type=int, default=200_000, help="Number of phones/emails to validate")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case (best is reported)")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    args = parser.parse_args()
+
+    report = run(args.count, args.repeat)
+
+    if args.json:
+        print(json.dumps(report))
+        return
+
+    print(f"{report['count']} items, best of {report['repeat']}")
+    for name, ns in report["ns_per_item"].items():
+        print(f"  {name:<18} {ns:>8.1f} ns/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,376 @@
+"""
+Benchmark suite: times the whole bot on books built by generate_data.
+
+Usage:
+    python benchmarks/run_suite.py [--sizes 1000,10000,100000,1000000] [--repeat R]
+                                   [--output FILE] [--compare OLD.json] [--json]
+
+For every size it measures:
+    queries        each AddressBook query (seconds per call)
+    storage        save/load of every storage format, save_all and load_all
+    import_export  export_file and import_file for CSV and JSON
+    commands       commands.dispatch for every registered command, output discarded
+    startup        `python main.py` with the saved book: up to the first prompt, up to
+                   exit, and `-X importtime` for the modules in IMPORT_WATCH
+
+Times are the best of 'repeat' runs. Data files go to a temporary directory
+(ASSISTANT_BOT_DATA_DIR), never to user_address_book. Write the report with
+--output on two commits and pass the older one to --compare to see ratios.
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must be set before assistant_bot.config is imported.
+DATA_DIR = tempfile.mkdtemp(prefix="assistant-bot-bench-")
+os.environ["ASSISTANT_BOT_DATA_DIR"] = DATA_DIR
+
+# Ensure the package is importable when running from the project root
+sys.path.append(PROJECT_ROOT)
+
+from generate_data import generate_address_book
+from assistant_bot.models import AddressBook
+from assistant_bot.utils.console import console
+from assistant_bot import commands, import_export, storage
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+LOOKUP_CALLS = 1000        # calls per point-lookup measurement
+SAMPLE_IMPORT_COUNT = 1000  # contacts in the file used by the 'import' command
+REGRESSION_RATIO = 1.2     # --compare flags results slower than this
+FIRST_PROMPT_TARGET = 0.3  # seconds from launching main.py to the first 'bot>' prompt
+
+# Modules reported from `python -X importtime -c "import main"` (cumulative
+# time where each is first imported; a module missing from the report was
+# not loaded before the first prompt).
+IMPORT_WATCH = (
+    "main",
+    "assistant_bot.app",
+    "assistant_bot.commands",
+    "assistant_bot.storage",
+    "assistant_bot.import_export",
+    "prompt_toolkit",
+    "rich.console",
+    "rich.table",
+    "pickle",
+    "csv",
+)
+
+BENCH_NAME = "Bench_User"
+
+# Run in order, so each cycle creates and then removes the benchmark contact.
+# Unpaged listings use --format tsv to keep large runs bounded; the rich
+# tables are covered by list, all, search and filter_by_tag.
+COMMAND_LINES = [
+    "help",
+    f"add {BENCH_NAME} 0509990001 bench@example.com 01-01-1990",
+    f"add_phone {BENCH_NAME} 0509990002",
+    f"change {BENCH_NAME} 0509990002 0509990003",
+    f"phone {BENCH_NAME}",
+    f"add_email {BENCH_NAME} bench2@example.com",
+    f"add_birthday {BENCH_NAME} 02-02-1990",
+    f"add_note {BENCH_NAME} benchmark note",
+    f"edit_note {BENCH_NAME} 1 edited benchmark note",
+    "search_notes benchmark",
+    f"list_notes {BENCH_NAME}",
+    f"delete_note {BENCH_NAME} 1",
+    f"add_tag {BENCH_NAME} benchmark",
+    "filter_by_tag benchmark",
+    "filter_by_tag work",
+    f"remove_tag {BENCH_NAME} benchmark",
+    "list_tags --format tsv",
+    f"days_to_bday {BENCH_NAME}",
+    "birthdays 7 --format tsv",
+    "search john",
+    "list",
+    "all",
+    "export {tmp}/export.csv",
+    "import {tmp}/sample.csv",
+    f"delete {BENCH_NAME}",
+    "delete_all",  # answered 'no'
+    "stats --format tsv",
+    "exit",
+    "close",
+]
+
+
+def best_of(func: Callable[[], Any], repeat: int, calls: int = 1) -> float:
+    """Best wall time of 'repeat' runs, divided by the calls each run makes."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best / calls
+
+
+def generate(count: int, seed: int) -> AddressBook:
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return generate_address_book(count)
+
+
+def clear_data_dir() -> None:
+    storage.flush()
+    for entry in os.listdir(DATA_DIR):
+        os.remove(os.path.join(DATA_DIR, entry))
+
+
+# --- Groups ---
+
+def bench_queries(book: AddressBook, repeat: int) -> Dict[str, float]:
+    records = list(book.values())[:LOOKUP_CALLS]
+    names = [r.name.value for r in records]
+    phones = [r.phones[0].value for r in records if r.phones]
+    emails = [r.email.value for r in records if r.email]
+
+    def calls(method: Callable[[Any], Any], args: List[Any]) -> Callable[[], None]:
+        return lambda: [method(arg) for arg in args]
+
+    results = {"search.cold": best_of(lambda: book.search("john"), 1)}
+    results.update({
+        "find": best_of(calls(book.find, names), repeat, len(names)),
+        "find_phone_global": best_of(calls(book.find_phone_global, phones), repeat, len(phones)),
+        "find_email_global": best_of(calls(book.find_email_global, emails), repeat, len(emails)),
+        "search": best_of(lambda: book.search("john"), repeat),
+        "search.ranked": best_of(lambda: book.search("john", ranked=True), repeat),
+        "search_notes": best_of(lambda: book.search_notes("coffee"), repeat),
+        "find_by_tag": best_of(lambda: book.find_by_tag("work"), repeat),
+        "get_all_tags": best_of(book.get_all_tags, repeat),
+        "get_unique_tags": best_of(book.get_unique_tags, repeat),
+        "get_upcoming_birthdays": best_of(lambda: book.get_upcoming_birthdays(7), repeat),
+        "iter_rows": best_of(lambda: sum(1 for _ in book.iter_rows()), repeat),
+    })
+    return results
+
+
+def bench_storage(book: AddressBook, repeat: int) -> Dict[str, float]:
+    clear_data_dir()
+
+    def save_all() -> None:
+        book.mark_dirty()
+        storage.save_all(book)
+
+    results = {"save_all": best_of(save_all, repeat)}
+    results.update({
+        "load_all": best_of(storage.load_all, repeat),
+        "save_json": best_of(lambda: storage.save_address_book(book), repeat),
+        "load_json": best_of(storage.load_address_book, repeat),
+        "save_pickle": best_of(lambda: storage.save_pickle(book), repeat),
+        "load_pickle": best_of(storage.load_pickle, repeat),
+        "save_snapshot": best_of(lambda: storage.save_snapshot(book), repeat),
+        "load_snapshot": best_of(storage.load_snapshot, repeat),
+        "save_csv": best_of(lambda: storage.save_csv(book), repeat),
+    })
+    # Leave a consistent set of files behind for the startup run.
+    save_all()
+    return results
+
+
+def bench_import_export(book: AddressBook, repeat: int, tmp: str) -> Dict[str, float]:
+    results = {}
+    for fmt in ("csv", "json"):
+        path = os.path.join(tmp, f"roundtrip.{fmt}")
+        results[f"export_{fmt}"] = best_of(lambda: import_export.export_file(book, path), repeat)
+        results[f"import_{fmt}"] = best_of(lambda: import_export.import_file(AddressBook(), path), repeat)
+    return results
+
+
+def bench_commands(book: AddressBook, repeat: int, tmp: str) -> Dict[str, float]:
+    import_export.export_file(generate(SAMPLE_IMPORT_COUNT, seed=SAMPLE_IMPORT_COUNT), os.path.join(tmp, "sample.csv"))
+    lines = [line.format(tmp=tmp) for line in COMMAND_LINES]
+
+    covered = {line.split()[0] for line in lines}
+    for name in sorted(set(commands.COMMAND_REGISTRY) - covered):
+        print(f"warning: no benchmark line for command '{name}'", file=sys.stderr)
+
+    results: Dict[str, float] = {}
+    stdin = sys.stdin
+    try:
+        for _ in range(repeat):
+            for line in lines:
+                sys.stdin = io.StringIO("no\n")
+                started = time.perf_counter()
+                commands.dispatch(book, line)
+                elapsed = time.perf_counter() - started
+                key = line.replace(tmp, "$TMP")
+                results[key] = min(results.get(key, elapsed), elapsed)
+            storage.flush()
+    finally:
+        sys.stdin = stdin
+    return results
+
+
+def bench_startup(repeat: int) -> Dict[str, float]:
+    """Runs main.py on the saved book and exits at the first prompt."""
+    main_py = os.path.join(PROJECT_ROOT, "main.py")
+
+    def run() -> None:
+        subprocess.run(
+            [sys.executable, main_py],
+            input=b"exit\n",
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd=PROJECT_ROOT,
+            check=True
+        )
+
+    def first_prompt() -> float:
+        started = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, main_py], stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                stderr=subprocess.DEVNULL, cwd=PROJECT_ROOT)
+        output = b""
+        while b"bot>" not in output:
+            chunk = os.read(proc.stdout.fileno(), 65536)
+            if not chunk:
+                break
+            output += chunk
+        elapsed = time.perf_counter() - started
+        proc.communicate(b"exit\n")
+        return elapsed
+
+    results = {
+        "main": best_of(run, repeat),
+        "first_prompt": min(first_prompt() for _ in range(repeat)),
+    }
+    results.update(import_times(repeat))
+    return results
+
+
+def import_times(repeat: int) -> Dict[str, float]:
+    """Best cumulative -X importtime of each IMPORT_WATCH module that main.py loads."""
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                                capture_output=True, text=True, cwd=PROJECT_ROOT, check=True)
+        # "import time: self [us] | cumulative | imported package"
+        for line in result.stderr.splitlines():
+            parts = line.split("|")
+            if len(parts) != 3 or not parts[1].strip().isdigit():
+                continue
+            name = parts[2].strip()
+            if name in IMPORT_WATCH:
+                seconds = int(parts[1]) / 1e6
+                best[f"import {name}"] = min(best.get(f"import {name}", seconds), seconds)
+    return best
+
+
+# --- Runner ---
+
+def run_size(count: int, repeat: int) -> Dict[str, Any]:
+    started = time.perf_counter()
+    book = generate(count, seed=count)
+    report: Dict[str, Any] = {"count": count, "generate_seconds": time.perf_counter() - started}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        report["queries"] = bench_queries(book, repeat)
+        report["storage"] = bench_storage(book, repeat)
+        report["import_export"] = bench_import_export(book, repeat, tmp)
+        report["startup"] = bench_startup(repeat)
+        report["commands"] = bench_commands(book, repeat, tmp)
+
+    clear_data_dir()
+    return report
+
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def flatten(report: Dict[str, Any]) -> Dict[Tuple[int, str, str], float]:
+    """Maps (count, group, name) to seconds."""
+    flat = {}
+    for size in report["sizes"]:
+        for group, values in size.items():
+            if isinstance(values, dict):
+                for name, seconds in values.items():
+                    flat[(size["count"], group, name)] = seconds
+    return flat
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Ratios new/old for every result present in both reports."""
+    old = flatten(baseline)
+    rows = []
+    for key, seconds in flatten(report).items():
+        if key in old and old[key] > 0:
+            count, group, name = key
+            rows.append({"count": count, "group": group, "name": name,
+                         "old": old[key], "new": seconds, "ratio": round(seconds / old[key], 3)})
+    return rows
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    for size in report["sizes"]:
+        print(f"== {size['count']:,} contacts (generated in {size['generate_seconds']:.2f}s)")
+        for group in ("queries", "storage", "import_export", "startup", "commands"):
+            print(f"  [{group}]")
+            for name, seconds in size[group].items():
+                print(f"    {name:<56} {seconds * 1e6:>14,.1f} us")
+
+    for size in report["sizes"]:
+        first_prompt = size["startup"]["first_prompt"]
+        if first_prompt > FIRST_PROMPT_TARGET:
+            print(f"TARGET MISSED {size['count']:,} startup/first_prompt: "
+                  f"{first_prompt:.3f}s > {FIRST_PROMPT_TARGET}s")
+
+    for row in report.get("comparison", []):
+        if row["ratio"] >= REGRESSION_RATIO:
+            print(f"REGRESSION {row['count']:,} {row['group']}/{row['name']}: "
+                  f"{row['old'] * 1e6:,.1f} -> {row['new'] * 1e6:,.1f} us (x{row['ratio']})")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the full benchmark suite on generated books.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Comma-separated contact counts")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Earlier JSON report to compare against")
+    parser.add_argument("--json", action="store_true", help="Print the JSON report instead of a summary")
+    args = parser.parse_args()
+
+    console.file = open(os.devnull, "w", encoding="utf-8")
+    try:
+        report = {
+            "benchmark": "suite",
+            "revision": git_revision(),
+            "python": sys.version.split()[0],
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+            "sizes": [run_size(int(n), args.repeat) for n in args.sizes.split(",")],
+        }
+    finally:
+        storage.flush()
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
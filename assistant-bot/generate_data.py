@@ -1,13 +1,22 @@
+import io
 import os
+import csv
+import math
+import functools
 import argparse
 import random
 import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from datetime import date, timedelta
-from typing import List, Set, Dict
+from typing import Any, Deque, Iterator, List, Set, Dict, Optional, Tuple
 
 from assistant_bot.models import AddressBook, Record
 from assistant_bot import storage
 from assistant_bot import import_export
+from assistant_bot.snapshot import SnapshotRow, encode_rows, write_snapshot_chunks
+from assistant_bot.utils.atomic import atomic_write
+from assistant_bot.utils.validators import normalize_phones, validate_emails, format_phone, format_birthday
 
 # --- Constants ---
 
@@ -77,6 +86,15 @@ PREFIXES = [
     "091", "092", "094", "089", "090"
 ]
 
+# Streaming mode (see stream_address_book)
+STREAM_FORMATS = ('json', 'csv', 'snap')
+STREAM_CHUNK_SIZE = 10_000        # contacts generated per worker task
+STREAM_CHUNKS_PER_WORKER = 2      # tasks in flight per worker (bounds memory)
+
+_PHONE_SUFFIXES = 10 ** 7
+_PHONE_SPACE = len(PREFIXES) * _PHONE_SUFFIXES
+_BIRTHDAY_ORDINALS = range(date(1940, 1, 1).toordinal(), date(2007, 12, 31).toordinal() + 1)
+
 
 # --- Generators ---
 
@@ -96,20 +114,28 @@ def generate_email(name: str, index: int) -> str:
 
 def generate_birthday() -> str:
     """Generates a random birthday between 1940 and 2007."""
+    return format_birthday(_random_birthday())
+
+
+def _random_birthday() -> date:
     start_date = date(1940, 1, 1)
     end_date = date(2007, 12, 31)
     days_range = (end_date - start_date).days
     
     rand_days = random.randint(0, days_range)
-    bday = start_date + timedelta(days=rand_days)
-    return bday.strftime("%d-%m-%Y")
+    return start_date + timedelta(days=rand_days)
 
 
-def generate_address_book(count: int = COUNT) -> AddressBook:
-    """Generates a populated AddressBook with random data."""
-    book = AddressBook()
+def generate_address_book(count: int = COUNT, book: Optional[AddressBook] = None) -> AddressBook:
+    """
+    Generates a populated AddressBook with random data.
+    Pass an empty 'book' to fill a specific backend (e.g. ColumnarAddressBook).
+    """
+    if book is None:
+        book = AddressBook()
     generated_names: Set[str] = set()
     used_phones: Set[str] = set()
+    rows: List[Tuple[str, str, str, date, List[str], List[str]]] = []
 
     print(f"Generating {count} contacts...")
 
@@ -134,41 +160,247 @@ def generate_address_book(count: int = COUNT) -> AddressBook:
                 generated_names.add(candidate)
                 break
         
-        try:
-            record = Record(candidate)
-
-            # 2. Unique Phone
-            while True:
-                phone = generate_phone()
-                if phone not in used_phones:
-                    used_phones.add(phone)
-                    record.add_phone(phone)
-                    break
-
-            # 3. Email
-            record.add_email(generate_email(candidate, i))
+        # 2. Unique Phone
+        while True:
+            phone = generate_phone()
+            if phone not in used_phones:
+                used_phones.add(phone)
+                break
 
-            # 4. Birthday
-            record.add_birthday(generate_birthday())
+        # 3. Email
+        email = generate_email(candidate, i)
 
-            # 5. Notes (87% chance)
-            if i < (count * 0.87):
-                # 30% Long, 70% Short
-                if random.random() < 0.3:
-                    record.add_note(random.choice(NOTES_LONG))
-                else:
-                    record.add_note(random.choice(NOTES_SHORT))
+        # 4. Birthday
+        birthday = _random_birthday()
 
-            # 6. Tags (76% chance)
-            if i < (count * 0.76):
-                 record.add_tag(random.choice(TAGS_POOL))
+        # 5. Notes (87% chance)
+        notes: List[str] = []
+        if i < (count * 0.87):
+            # 30% Long, 70% Short
+            if random.random() < 0.3:
+                notes.append(random.choice(NOTES_LONG))
+            else:
+                notes.append(random.choice(NOTES_SHORT))
+
+        # 6. Tags (76% chance)
+        tags: List[str] = []
+        if i < (count * 0.76):
+            tags.append(random.choice(TAGS_POOL))
+
+        rows.append((candidate, phone, email, birthday, notes, tags))
+
+    # 7. Validate all phones and emails in one pass, then build the records
+    phones = normalize_phones(row[1] for row in rows)
+    emails_valid = validate_emails(row[2] for row in rows)
+
+    for (candidate, raw_phone, email, birthday, notes, tags), phone, email_valid in zip(rows, phones, emails_valid):
+        if phone is None or not email_valid:
+            invalid = f"Invalid phone number: {raw_phone}" if phone is None else f"Invalid email: {email}"
+            print(f"Skipping invalid generation entry for {candidate}: {invalid}")
+            continue
+        book.add_record(Record.from_trusted(
+            candidate,
+            phones=(phone,),
+            email=email,
+            birthday=birthday,
+            notes=notes,
+            tags=[Record._normalize_tag(tag) for tag in tags]
+        ))
 
-            book.add_record(record)
+    return book
 
-        except ValueError as e:
-            print(f"Skipping invalid generation entry for {candidate}: {e}")
 
-    return book
+# --- Streaming Generation ---
+#
+# Every contact is a pure function of (seed, index, count): names and phones
+# come from seeded permutations of the index, so they are unique without the
+# collision sets above, and chunks can be generated in any process, in any
+# order. Output depends on seed, count and chunk size, not on the worker count.
+
+# (seed, count, name offset, name step, phone offset, phone step)
+StreamLayout = Tuple[int, int, int, int, int, int]
+
+
+def _coprime_step(n: int, rng: random.Random) -> int:
+    """A random step that visits every residue mod n exactly once."""
+    if n <= 1:
+        return 1
+    while True:
+        step = rng.randrange(1, n)
+        if math.gcd(step, n) == 1:
+            return step
+
+
+def _stream_layout(count: int, seed: int) -> StreamLayout:
+    if count > _PHONE_SPACE:
+        raise ValueError(f"Cannot generate more than {_PHONE_SPACE} unique phones")
+    rng = random.Random(seed)
+    combos = len(FIRST_NAMES) * len(LAST_NAMES)
+    return (
+        seed, count,
+        rng.randrange(combos), _coprime_step(combos, rng),
+        rng.randrange(_PHONE_SPACE), _coprime_step(_PHONE_SPACE, rng),
+    )
+
+
+def _generate_rows(layout: StreamLayout, start: int, stop: int) -> List[SnapshotRow]:
+    """Generates contacts start..stop-1 as snapshot rows (packed phones, birthday ordinals)."""
+    seed, count, name_offset, name_step, phone_offset, phone_step = layout
+    rng = random.Random(f"{seed}:{start}")
+    size = stop - start
+    full_names = count // 2
+    first_count, combos = len(FIRST_NAMES), len(FIRST_NAMES) * len(LAST_NAMES)
+
+    # Batched draws: one call per column instead of one per contact
+    firsts = rng.choices(FIRST_NAMES, k=size)
+    lasts = rng.choices(LAST_NAMES, k=size)
+    domains = rng.choices(DOMAINS, k=size)
+    ordinals = rng.choices(_BIRTHDAY_ORDINALS, k=size)
+    long_notes = rng.choices(NOTES_LONG, k=size)
+    short_notes = rng.choices(NOTES_SHORT, k=size)
+    note_draws = [rng.random() for _ in range(size)]
+    tags = [Record._normalize_tag(tag) for tag in rng.choices(TAGS_POOL, k=size)]
+
+    rows: List[SnapshotRow] = []
+    for k, i in enumerate(range(start, stop)):
+        # Same split as generate_address_book: full names, then single names.
+        # The first occurrence of each name is a permutation of the index, so
+        # it is unique; every later one carries its index.
+        if i < full_names:
+            if i < combos:
+                pair = (i * name_step + name_offset) % combos
+                name = f"{FIRST_NAMES[pair % first_count]} {LAST_NAMES[pair // first_count]}"
+            else:
+                name = f"{firsts[k]} {lasts[k]} {i}"
+        else:
+            j = i - full_names
+            if j < first_count:
+                name = FIRST_NAMES[(j * name_step + name_offset) % first_count]
+            else:
+                name = f"{firsts[k]} {i}"
+
+        slot = (i * phone_step + phone_offset) % _PHONE_SPACE
+        number = 380_000_000_000 + int(PREFIXES[slot // _PHONE_SUFFIXES]) * _PHONE_SUFFIXES + slot % _PHONE_SUFFIXES
+
+        notes: Tuple[str, ...] = ()
+        if i < (count * 0.87):
+            notes = (long_notes[k] if note_draws[k] < 0.3 else short_notes[k],)
+
+        rows.append((
+            name,
+            (number,),
+            f"{name.lower().replace(' ', '.')}.{i}@{domains[k]}",
+            ordinals[k],
+            notes,
+            (tags[k],) if i < (count * 0.76) else ()
+        ))
+    return rows
+
+
+@functools.lru_cache(maxsize=None)
+def _birthday_strings() -> List[str]:
+    """'DD-MM-YYYY' for every ordinal in _BIRTHDAY_ORDINALS (built once per process)."""
+    return [format_birthday(date.fromordinal(ordinal)) for ordinal in _BIRTHDAY_ORDINALS]
+
+
+def _generate_chunk(fmt: str, layout: StreamLayout, start: int, stop: int) -> Any:
+    """
+    Worker task: generates one chunk, already encoded for 'fmt'.
+    JSON chunks are object members without braces, CSV chunks are lines,
+    snapshot chunks are record blocks plus their names for the index.
+    """
+    rows = _generate_rows(layout, start, stop)
+    if fmt == 'snap':
+        return encode_rows(rows)
+
+    birthdays, first_ordinal = _birthday_strings(), _BIRTHDAY_ORDINALS[0]
+    if fmt == 'json':
+        encode = json.JSONEncoder(ensure_ascii=False, separators=(',', ':')).encode
+        return encode({
+            name: {
+                "phones": [format_phone(number) for number in numbers],
+                "email": email,
+                "birthday": birthdays[ordinal - first_ordinal],
+                "notes": list(notes),
+                "tags": list(tags)
+            }
+            for name, numbers, email, ordinal, notes, tags in rows
+        })[1:-1]
+
+    out = io.StringIO()
+    writer = csv.writer(out)
+    delimiters = import_export.CSV_DELIMITERS
+    writer.writerows(
+        (
+            name,
+            delimiters['phones'].join(format_phone(number) for number in numbers),
+            email,
+            birthdays[ordinal - first_ordinal],
+            delimiters['notes'].join(notes),
+            delimiters['tags'].join(tags)
+        )
+        for name, numbers, email, ordinal, notes, tags in rows
+    )
+    return out.getvalue()
+
+
+def _generate_chunks(fmt: str, layout: StreamLayout, chunk_size: int, workers: int) -> Iterator[Any]:
+    """Yields encoded chunks in order; at most STREAM_CHUNKS_PER_WORKER per worker are in flight."""
+    count = layout[1]
+    bounds = [(start, min(start + chunk_size, count)) for start in range(0, count, chunk_size)]
+    if workers <= 1 or len(bounds) <= 1:
+        for start, stop in bounds:
+            yield _generate_chunk(fmt, layout, start, stop)
+        return
+
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for start, stop in bounds:
+            pending.append(executor.submit(_generate_chunk, fmt, layout, start, stop))
+            if len(pending) >= workers * STREAM_CHUNKS_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def stream_address_book(
+    path: str,
+    count: int = COUNT,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> None:
+    """
+    Generates contacts straight into a .json, .csv or .snap file.
+    Chunks are built by 'workers' processes (default: os.cpu_count()) and
+    written in order, so no AddressBook is built and memory stays flat.
+    The files use the same layouts as import/export and storage.
+    """
+    fmt = path.lower().split('.')[-1]
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported output format '{fmt}' (use {', '.join(STREAM_FORMATS)})")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    print(f"Generating {count} contacts into {path}...")
+    chunks = _generate_chunks(fmt, _stream_layout(count, seed), chunk_size, workers)
+
+    if fmt == 'snap':
+        write_snapshot_chunks(chunks, path)
+        return
+
+    with atomic_write(path, 'w', newline='', encoding='utf-8') as f:
+        if fmt == 'csv':
+            csv.writer(f).writerow(import_export.CSV_HEADERS)
+            f.writelines(chunks)
+            return
+
+        opening = '{'
+        for chunk in chunks:
+            if chunk:
+                f.write(opening + chunk)
+                opening = ','
+        f.write('{}' if opening == '{' else '}')
 
 
 def save_examples(book: AddressBook, output_dir: str) -> None:
@@ -195,9 +427,21 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="Generate random contact data.")
     parser.add_argument("--output", help="Output directory for files", default="test_addressbook")
     parser.add_argument("--count", type=int, default=COUNT, help="Number of contacts to generate")
+    parser.add_argument("--seed", type=int, help="Random seed, for reproducible data")
+    parser.add_argument("--stream", metavar="FILE",
+                        help="Write contacts straight to FILE (.json, .csv or .snap) using worker processes")
+    parser.add_argument("--workers", type=int, help="Worker processes for --stream (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=STREAM_CHUNK_SIZE, help="Contacts per --stream task")
     
     args = parser.parse_args()
-    
+
+    if args.stream:
+        stream_address_book(args.stream, args.count, args.seed or 0, args.workers, args.chunk_size)
+        print("Done.")
+        return
+
+    if args.seed is not None:
+        random.seed(args.seed)
     book = generate_address_book(args.count)
     save_examples(book, args.output)
     print("Done.")
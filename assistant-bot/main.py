@@ -1,38 +1,104 @@
 import os
 import sys
+import argparse
+from typing import List, Optional, TextIO
 
 # Ensure the package is in the python path if running from root
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from assistant_bot import storage
-from assistant_bot.app import App
+from assistant_bot import commands, storage
+from assistant_bot.config import PROFILE_CAPTURE, PROFILE_CAPTURE_PATH
+from assistant_bot.models import AddressBook
+from assistant_bot.utils import stats
+from assistant_bot.utils.console import console
 from assistant_bot.utils.ux_messages import GOODBYE_MESSAGES
 
+# Failed lines listed in the --script summary (the rest are only counted)
+SCRIPT_FAILURES_SHOWN = 20
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Assistant Bot: contacts, notes, tags and birthdays.")
+    parser.add_argument("--script", metavar="FILE",
+                        help="Run the commands in FILE ('-' for stdin) without the prompt, then exit")
+    parser.add_argument("--stop-on-error", action="store_true",
+                        help="With --script, stop at the first line that fails")
+    parser.add_argument("--quiet", action="store_true",
+                        help="With --script, print only the summary (skips rendering every message)")
+    return parser.parse_args(argv)
+
+
+def run_script(address_book: AddressBook, path: str, stop_on_error: bool) -> int:
+    """
+    Runs a command script and prints a summary to stderr.
+    Returns the exit code: 0 if every line succeeded, 1 otherwise,
+    2 if the script could not be opened.
+    """
+    def run(f: TextIO) -> int:
+        executed, failures = commands.run_batch(address_book, f, stop_on_error)
+        print(f"Script: {executed} commands, {len(failures)} failed", file=sys.stderr)
+        for number, line, error in failures[:SCRIPT_FAILURES_SHOWN]:
+            print(f"  line {number}: {line}  ({error})", file=sys.stderr)
+        if len(failures) > SCRIPT_FAILURES_SHOWN:
+            print(f"  ... and {len(failures) - SCRIPT_FAILURES_SHOWN} more", file=sys.stderr)
+        return 1 if failures else 0
+
+    if path == "-":
+        return run(sys.stdin)
+    try:
+        f = open(path, "r", encoding="utf-8")
+    except OSError as e:
+        print(f"Cannot read script: {e}", file=sys.stderr)
+        return 2
+    with f:
+        return run(f)
+
 
 def main() -> None:
     """
     Main entry point for the Assistant Bot application.
     Handles data loading, application lifecycle, and clean shutdown.
+    With --script, runs the commands from a file instead of the prompt and
+    exits with status 1 if any of them failed.
     """
-    # 1. Load Data (Pickle with JSON fallback)
-    address_book = storage.load_pickle()
+    args = parse_args()
+    exit_code = 0
+
+    if PROFILE_CAPTURE:
+        stats.start_capture(PROFILE_CAPTURE, PROFILE_CAPTURE_PATH)
 
-    if address_book is None:
-        address_book = storage.load_address_book()
+    with stats.profiled():
+        # 1. Load Data (best intact format: Binary snapshot, Pickle, JSON, CSV backup)
+        address_book = storage.load_all()
 
-    # 2. Strict Sync (Ensure all formats are consistent on startup)
-    storage.save_all(address_book)
+        # 2. Replay Journal (changes made since the last full snapshot)
+        storage.replay_journal(address_book)
 
-    # 3. Application Loop
-    app = App(address_book)
+        # 3. Strict Sync (Ensure all formats are consistent on startup).
+        # Only stale formats are rewritten, so a clean start writes nothing.
+        storage.save_all(address_book)
+
+    # 4. Application Loop (or the script, which needs no prompt_toolkit)
     try:
-        app.run()
+        if args.script:
+            console.quiet = args.quiet
+            exit_code = run_script(address_book, args.script, args.stop_on_error)
+        else:
+            from assistant_bot.app import App
+            App(address_book).run()
     except (KeyboardInterrupt, SystemExit):
         pass
     finally:
-        # 4. Save & Exit
+        # 5. Save & Exit (wait for the background writer first)
+        storage.flush()
         storage.save_all(address_book)
-        print(GOODBYE_MESSAGES[0])
+        capture = stats.stop_capture()
+        if capture:
+            print(f"Capture written to {capture}", file=sys.stderr if args.script else sys.stdout)
+        if not args.script:
+            print(GOODBYE_MESSAGES[0])
+
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':